@@ -0,0 +1,431 @@
+"""
+Micro-benchmarks for the crawler's hot paths.
+
+    python scripts/benchmark.py                    # everything below
+    python scripts/benchmark.py adapt              # adapt_blocks throughput on large bodies
+    python scripts/benchmark.py adapt --sizes 100 1000 10000
+    python scripts/benchmark.py parse              # parser backends on synthetic article pages
+    python scripts/benchmark.py parse --cache      # ... on every article page in the response cache
+    python scripts/benchmark.py board              # parse/adapt/render/index/search on synthetic boards
+                                                   # and the fixture pages in benchmark_fixtures/
+    python scripts/benchmark.py board --sizes 100000 --no-memory --no-fixtures
+    python scripts/benchmark.py record             # replace benchmark_fixtures/ with cached fbo.or.kr article pages
+    python scripts/benchmark.py board --check      # compare against benchmark_baseline.json
+    python scripts/benchmark.py board --save-baseline
+"""
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import platform
+import random
+import re
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPTS_DIR)
+import crawling_to_blog as crawler
+from bs4 import BeautifulSoup
+
+FIXTURE_DIR = os.path.join(SCRIPTS_DIR, "benchmark_fixtures")  # fbo.or.kr article pages (see `record`)
+BASELINE_PATH = os.path.join(SCRIPTS_DIR, "benchmark_baseline.json")
+REGRESSION_TOLERANCE = 0.25  # --check fails when a stage is this much slower than the baseline
+MIN_CHECK_SECONDS = 0.05     # stages faster than this in the baseline are too noisy to check
+BOARD_STAGES = ("parse", "adapt", "render", "index", "search")
+
+
+def legacy_adapt_blocks(raw_blocks):
+    """The pre-rule-engine classification loop, kept as a reference for comparison."""
+    final_html = ""
+    intro_done = False
+    for block in raw_blocks:
+        if not intro_done:
+            block = re.sub(r'(\d{4}[-.]\d{1,2}[-.]\d{1,2}|\d{4}년\s?\d{1,2}월\s?\d{1,2}일)', r'<span class="highlight-green">\1</span>', block)
+            block = re.sub(r'(\d+(?:,\d{3})*원|\d+(?:\.\d+)?%)', r'<span class="highlight-green">\1</span>', block)
+            final_html += f'<div class="intro-box"><span class="intro-label">요약</span>{block}</div>\n'
+            intro_done = True
+            continue
+        is_header = False
+        if block.startswith(('□', '○', 'ㅇ', 'o', '-', '1.', '[', '<')):
+            is_header = True
+            clean_text = re.sub(r'^[\□\○\ㅇ\-\1\.\s]+', '', block).strip()
+        else:
+            clean_text = block
+        if len(block) < 40 and not block.endswith(('.', ',')):
+            is_header = True
+        if is_header:
+            final_html += f"<h3>{clean_text}</h3>\n"
+        else:
+            body_text = block
+            body_text = re.sub(r'(\d{4}[-.]\d{1,2}[-.]\d{1,2}|\d{4}년\s?\d{1,2}월\s?\d{1,2}일)', r'<span class="highlight-green">\1</span>', body_text)
+            body_text = re.sub(r'(\d+(?:,\d{3})*원|\d+(?:\.\d+)?%)', r'<span class="highlight-green">\1</span>', body_text)
+            body_text = body_text.replace('. ', '.<br>')
+            final_html += f"<p>{body_text}</p>\n"
+    return final_html
+
+
+SAMPLE_SENTENCES = [
+    "한국농어촌공사(사장 김인중)는 {y}년 {m}월 {d}일부터 농지은행 사업을 확대한다고 밝혔다.",
+    "공사는 {y}.{m}.{d} 기준으로 총 {amount}원을 투입해 청년 농업인을 지원한다.",
+    "이는 전년 대비 약 {pct}% 증가한 수준으로, 역대 최대 규모다.",
+    "선임대후매도 사업은 최장 30년간 장기 임대 후 매도하는 방식이다.",
+    "자세한 내용은 농지은행 통합포털 누리집에서 확인할 수 있다.",
+]
+SAMPLE_HEADERS = ["□ 주요 내용", "○ 추진 배경", "- 문의: 농지은행처", "청년 농업인 지원 확대", "[참고] 세부 일정"]
+
+
+def synthetic_blocks(n_blocks, seed=0):
+    """A press-release-like body of `n_blocks` blocks (~1 in 5 is a header)."""
+    rng = random.Random(seed)
+    blocks = []
+    for i in range(n_blocks):
+        if i and rng.random() < 0.2:
+            blocks.append(rng.choice(SAMPLE_HEADERS))
+            continue
+        sentences = [
+            rng.choice(SAMPLE_SENTENCES).format(
+                y=rng.randint(2015, 2026), m=rng.randint(1, 12), d=rng.randint(1, 28),
+                amount=f"{rng.randint(1, 10**9):,}", pct=round(rng.random() * 300, 1))
+            for _ in range(rng.randint(2, 5))
+        ]
+        blocks.append(" ".join(sentences))
+    return blocks
+
+
+def best_of(func, arg, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(arg)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_adapt_blocks(sizes, repeat):
+    print(f"{'blocks':>8} {'body KB':>9} {'legacy ms':>10} {'rules ms':>10} {'rules MB/s':>11} {'speedup':>8}")
+    for n in sizes:
+        blocks = synthetic_blocks(n)
+        assert crawler.adapt_blocks(blocks) == legacy_adapt_blocks(blocks), "output differs from legacy"
+        size = sum(len(b.encode("utf-8")) for b in blocks)
+        legacy = best_of(legacy_adapt_blocks, blocks, repeat)
+        rules = best_of(crawler.adapt_blocks, blocks, repeat)
+        print(f"{n:>8} {size / 1024:>9.1f} {legacy * 1000:>10.2f} {rules * 1000:>10.2f} "
+              f"{size / rules / 2**20:>11.1f} {legacy / rules:>7.1f}x")
+
+
+def legacy_parse_article(html):
+    """Full-document html.parser parse, as fetch_article() did before parser backends."""
+    soup = BeautifulSoup(html, 'html.parser')
+    title_node = soup.select_one("div.viewTit > h4")
+    meta_node = soup.select_one("div.viewTit ul")
+    content_node = soup.select_one("div.viewContent")
+    files = []
+    file_node = soup.select_one("div.viewFile")
+    if file_node:
+        links = file_node.select("dd.fileName a")
+        if not links: links = file_node.select("a")
+        files = [(link.get('href'), link.get_text(strip=True)) for link in links]
+    return {
+        "title": title_node.get_text(strip=True) if title_node else None,
+        "meta": meta_node.get_text() if meta_node else None,
+        "blocks": crawler.content_blocks(content_node) if content_node else None,
+        "files": files,
+    }
+
+
+def synthetic_article_page(n_blocks, seed=0):
+    """An fbo.or.kr-shaped article page: site chrome around viewTit/viewContent/viewFile."""
+    rng = random.Random(seed)
+    menu = "".join(f'<li><a href="/menu{i}.do">메뉴 {i}</a><ul>' + "".join(
+        f'<li><a href="/menu{i}_{j}.do">하위 메뉴 {j}</a></li>' for j in range(8)) + "</ul></li>" for i in range(40))
+    body = "".join(f"<p>{block}</p>" if rng.random() < 0.5 else f"{block}<br>"
+                   for block in synthetic_blocks(n_blocks, seed))
+    return f"""<!DOCTYPE html><html lang="ko"><head><title>농지은행</title>
+<script>var menu = {json.dumps(["x"] * 200)};</script></head><body>
+<div id="header"><ul class="gnb">{menu}</ul></div>
+<div id="content"><div class="viewTit"><h4>[보도자료] 벤치마크 기사 {seed}</h4>
+<ul><li>작성자 관리자</li><li>등록일 2025-0{seed % 9 + 1}-15</li></ul></div>
+<div class="viewContent">{body}</div>
+<div class="viewFile"><dl><dt>첨부파일</dt><dd class="fileName"><a href="NoticeDownload.do?ntceMngid=1&msn=1">첨부 {seed}.pdf</a></dd></dl></div>
+</div><div id="footer">{menu}</div></body></html>"""
+
+
+def cached_article_pages():
+    """Article page bodies from the crawler's response cache (see crawling_to_blog.cached_get)."""
+    pages = []
+    for entry_path in glob.glob(os.path.join(crawler.CACHE_DIR, "urls", "*.json")):
+        with open(entry_path, encoding="utf-8") as f:
+            entry = json.load(f)
+        if "NoticeView.do" in entry["url"]:
+            with open(os.path.join(crawler.CACHE_DIR, "blobs", entry["blob"]), "rb") as f:
+                pages.append(f.read().decode("utf-8", errors="replace"))
+    return pages
+
+
+def bench_parse(pages, repeat):
+    """Parses every page with each backend; checks output matches the legacy full parse."""
+    size = sum(len(p.encode("utf-8")) for p in pages)
+    print(f"{len(pages)} pages, {size / 1024:.0f} KB")
+    expected = [legacy_parse_article(p) for p in pages]
+    def run_legacy(pages):
+        for p in pages:
+            legacy_parse_article(p)
+    legacy = best_of(run_legacy, pages, repeat)
+    print(f"{'backend':>22} {'ms':>9} {'pages/s':>9} {'speedup':>8}  output")
+    print(f"{'legacy (full parse)':>22} {legacy * 1000:>9.1f} {len(pages) / legacy:>9.0f} {1:>7.1f}x  reference")
+    for name in sorted(crawler.PARSER_BACKENDS):
+        try:
+            backend = crawler.get_parser(name)
+        except Exception as e:
+            print(f"{name:>22} unavailable ({e.__class__.__name__}: {e})")
+            continue
+        mismatches = sum(backend.parse_article(p) != e for p, e in zip(pages, expected))
+        def run(pages):
+            for p in pages:
+                backend.parse_article(p)
+        elapsed = best_of(run, pages, repeat)
+        verdict = "identical" if not mismatches else f"{mismatches} pages differ"
+        print(f"{name:>22} {elapsed * 1000:>9.1f} {len(pages) / elapsed:>9.0f} {legacy / elapsed:>7.1f}x  {verdict}")
+
+
+def board_pages(n_articles, templates=200):
+    """
+    `n_articles` article pages of a synthetic board, generated lazily. Pages are
+    built from a pool of templates with a per-article title, so generating them
+    costs next to nothing next to the stages being measured.
+    """
+    rng = random.Random(n_articles)
+    pool = [synthetic_article_page(rng.randint(10, 80), seed) for seed in range(min(templates, n_articles))]
+    for i in range(n_articles):
+        seed = i % len(pool)
+        yield {"url": f"{crawler.BASE_URL}/info/bbs/NoticeView.do?ntceMngid={202500000000 + i}",
+               "html": pool[seed].replace(f"벤치마크 기사 {seed}<", f"벤치마크 기사 {i}<", 1)}
+
+
+def fixture_paths():
+    paths = sorted(glob.glob(os.path.join(FIXTURE_DIR, "*.html")))
+    if not paths:
+        # An empty board would report zeros, which look like a result
+        sys.exit(f"No fixture pages in {FIXTURE_DIR}; run `benchmark.py record` after a crawl.")
+    return paths
+
+
+def fixture_pages():
+    for path in fixture_paths():
+        with open(path, encoding="utf-8") as f:
+            aid = os.path.splitext(os.path.basename(path))[0]
+            yield {"url": f"{crawler.BASE_URL}/info/bbs/NoticeView.do?ntceMngid={aid}", "html": f.read()}
+
+
+def dir_bytes(path):
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+def run_board(pages, trace=False, chunk=crawler.CHECKPOINT_EVERY * 50):
+    """
+    Streams `pages` through the crawler's stages the way crawl() does, timing
+    each stage. Index and search run at the end / in chunks like checkpoints.
+    Precompression is off, so the numbers do not depend on brotli being installed.
+    Returns {stage: {"seconds", "items", "input_bytes", "output_bytes", "peak_bytes"}}.
+    """
+    stats = {stage: {"seconds": 0.0, "items": 0, "input_bytes": 0, "output_bytes": 0, "peak_bytes": 0}
+             for stage in BOARD_STAGES}
+    backend = crawler.get_parser()
+
+    def measure(stage, func, *args):
+        if trace:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        result = func(*args)
+        stats[stage]["seconds"] += time.perf_counter() - start
+        stats[stage]["items"] += 1
+        if trace:
+            stats[stage]["peak_bytes"] = max(stats[stage]["peak_bytes"], tracemalloc.get_traced_memory()[1] - base)
+        return result
+
+    old_blog_dir, old_state_dir, old_compressors = crawler.BLOG_DIR, crawler.STATE_DIR, crawler._compressors
+    out_dir = tempfile.mkdtemp(prefix="bench-blog-")
+    state_dir = tempfile.mkdtemp(prefix="bench-state-")
+    crawler.BLOG_DIR, crawler.STATE_DIR, crawler._compressors = out_dir, state_dir, []
+    try:
+        entries, docs = [], []
+        for i, page in enumerate(pages):
+            fields = measure("parse", backend.parse_article, page["html"])
+            stats["parse"]["input_bytes"] += len(page["html"].encode("utf-8"))
+            blocks = fields["blocks"] or []
+            content = measure("adapt", crawler.adapt_blocks, blocks)
+            block_bytes = sum(len(b.encode("utf-8")) for b in blocks)
+            stats["parse"]["output_bytes"] += block_bytes
+            stats["adapt"]["input_bytes"] += block_bytes
+            stats["adapt"]["output_bytes"] += len(content.encode("utf-8"))
+            title = fields["title"] or "제목 없음"
+            article = {"title": title, "content": content, "date": "2025.01.01", "url": page["url"], "files": []}
+            fname, html = measure("render", crawler.render_article, article)
+            stats["render"]["output_bytes"] += len(html.encode("utf-8"))
+            display_title = title.replace('[보도자료]', '').strip()
+            aid = crawler.article_id(page["url"])
+            entries.append({"id": aid, "file": fname, "title": display_title, "date": article["date"],
+                            "preview": re.sub(r'<[^>]+>', '', content)[:60] + "..."})
+            docs.append({"id": aid, "file": fname, "title": display_title, "date": article["date"],
+                         "text": crawler.search_text(content)})
+            if len(docs) >= chunk:
+                measure("search", crawler.update_search_index, docs)
+                docs = []
+        if docs:
+            measure("search", crawler.update_search_index, docs)
+        measure("index", crawler.update_index, entries, True)
+        stats["index"]["items"] = stats["search"]["items"] = len(entries)
+        stats["index"]["output_bytes"] = dir_bytes(out_dir) - dir_bytes(os.path.join(out_dir, crawler.SEARCH_DIR))
+        stats["search"]["output_bytes"] = dir_bytes(os.path.join(out_dir, crawler.SEARCH_DIR))
+    finally:
+        crawler.BLOG_DIR, crawler.STATE_DIR, crawler._compressors = old_blog_dir, old_state_dir, old_compressors
+        shutil.rmtree(out_dir, ignore_errors=True)
+        shutil.rmtree(state_dir, ignore_errors=True)
+    return stats
+
+
+def quietly(func, *args, **kwargs):
+    """update_index() and friends print progress; keep it out of the report."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+def bench_board(boards, memory=True):
+    """boards: [(name, pages_factory)]. Returns {name: {stage: summary}} for the baseline."""
+    results = {}
+    print(f"{'board':>16} {'stage':>7} {'items/s':>10} {'MB/s in':>8} {'peak MB':>8} {'out MB':>8} {'total s':>8}")
+    for name, pages in boards:
+        stats = quietly(run_board, pages())
+        if memory:
+            tracemalloc.start()
+            try:
+                traced = quietly(run_board, pages(), trace=True)
+            finally:
+                tracemalloc.stop()
+            for stage in BOARD_STAGES:
+                stats[stage]["peak_bytes"] = traced[stage]["peak_bytes"]
+        results[name] = {}
+        for stage in BOARD_STAGES:
+            st = stats[stage]
+            seconds = max(st["seconds"], 1e-9)
+            summary = {"items_per_sec": round(st["items"] / seconds, 1),
+                       "seconds": round(st["seconds"], 4),
+                       "peak_bytes": st["peak_bytes"] if memory else None,
+                       "output_bytes": st["output_bytes"]}
+            results[name][stage] = summary
+            peak = f"{st['peak_bytes'] / 2**20:>8.1f}" if memory else f"{'-':>8}"
+            mb_in = f"{st['input_bytes'] / seconds / 2**20:>8.1f}" if st["input_bytes"] else f"{'-':>8}"
+            print(f"{name:>16} {stage:>7} {summary['items_per_sec']:>10.0f} {mb_in} {peak} "
+                  f"{st['output_bytes'] / 2**20:>8.2f} {st['seconds']:>8.2f}")
+    return results
+
+
+def check_baseline(results, tolerance=REGRESSION_TOLERANCE):
+    """Prints throughput against the stored baseline; returns False on a regression."""
+    if not os.path.exists(BASELINE_PATH):
+        print(f"No baseline at {BASELINE_PATH}; run with --save-baseline first.")
+        return True
+    with open(BASELINE_PATH, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    ok = True
+    for name, stages in results.items():
+        for stage, summary in stages.items():
+            base = baseline.get(name, {}).get(stage)
+            if not base:
+                continue
+            ratio = summary["items_per_sec"] / base["items_per_sec"]
+            status = "ok"
+            if base["seconds"] < MIN_CHECK_SECONDS:
+                status = "too short to compare"
+            elif ratio < 1 - tolerance:
+                status, ok = "REGRESSION", False
+            if summary["output_bytes"] != base["output_bytes"]:
+                status += " (output size changed)"
+            print(f"{name:>16} {stage:>7} {ratio:>6.2f}x baseline  {status}")
+    return ok
+
+
+def save_baseline(results):
+    data = {"machine": platform.platform(), "python": platform.python_version(),
+            "parser": crawler.PARSER_BACKEND, "results": results}
+    crawler._atomic_write(BASELINE_PATH, json.dumps(data, ensure_ascii=False, indent=1) + "\n")
+    print(f"Saved baseline to {BASELINE_PATH}")
+
+
+def record_fixtures():
+    """Replaces the pages in FIXTURE_DIR with the article pages in the crawler's response cache."""
+    entries = []
+    for entry_path in glob.glob(os.path.join(crawler.CACHE_DIR, "urls", "*.json")):
+        with open(entry_path, encoding="utf-8") as f:
+            entry = json.load(f)
+        if "NoticeView.do" in entry["url"]:
+            entries.append(entry)
+    if not entries:
+        sys.exit(f"No article pages in {crawler.CACHE_DIR}; crawl first.")
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    for path in glob.glob(os.path.join(FIXTURE_DIR, "*.html")):
+        os.remove(path)
+    for entry in entries:
+        shutil.copyfile(os.path.join(crawler.CACHE_DIR, "blobs", entry["blob"]),
+                        os.path.join(FIXTURE_DIR, crawler.article_id(entry["url"]) + ".html"))
+    print(f"Recorded {len(entries)} article pages into {FIXTURE_DIR}; re-run `board --save-baseline`.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Crawler micro-benchmarks (all of them by default).")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per measurement (best is kept)")
+    parser.set_defaults(bench=None, sizes=[50, 500, 5000, 50000], pages=50, cache=False)
+    sub = parser.add_subparsers(dest="bench")
+    adapt = sub.add_parser("adapt", help="adapt_blocks throughput on large bodies")
+    adapt.add_argument("--sizes", type=int, nargs="+", default=[50, 500, 5000, 50000],
+                       help="body sizes in blocks")
+    parse = sub.add_parser("parse", help="parser backends on article pages")
+    parse.add_argument("--pages", type=int, default=50, help="synthetic pages to parse")
+    parse.add_argument("--cache", action="store_true",
+                       help=f"use the article pages in {crawler.CACHE_DIR} instead of synthetic ones")
+    board = sub.add_parser("board", help="per-stage throughput, peak memory and output size on whole boards")
+    board.add_argument("--sizes", type=int, nargs="+", default=[100, 1000],
+                       help="synthetic board sizes in articles (default: 100 1000; 10000+ takes minutes)")
+    board.add_argument("--no-fixtures", dest="fixtures", action="store_false",
+                       help=f"skip the board made of the pages in {FIXTURE_DIR}")
+    board.add_argument("--no-memory", dest="memory", action="store_false",
+                       help="skip the (slower) traced pass that measures peak memory")
+    board.add_argument("--check", action="store_true",
+                       help=f"fail if a stage is over {REGRESSION_TOLERANCE:.0%} slower than {os.path.basename(BASELINE_PATH)}")
+    board.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    sub.add_parser("record", help=f"replace the pages in {FIXTURE_DIR} with cached article pages")
+    args = parser.parse_args(argv)
+
+    if args.bench == "record":
+        record_fixtures()
+        return
+    if args.bench == "board":
+        boards = [(f"synthetic-{n}", lambda n=n: board_pages(n)) for n in args.sizes]
+        if args.fixtures:
+            fixture_paths()  # fail before the synthetic boards have run
+            boards.append(("fixtures", fixture_pages))
+        results = bench_board(boards, args.memory)
+        if args.save_baseline:
+            save_baseline(results)
+        elif args.check and not check_baseline(results):
+            sys.exit(1)
+        return
+    if args.bench in (None, "adapt"):
+        bench_adapt_blocks(args.sizes, args.repeat)
+    if args.bench in (None, "parse"):
+        if args.cache:
+            pages = cached_article_pages()
+        else:
+            pages = [synthetic_article_page(40, seed) for seed in range(args.pages)]
+        bench_parse(pages, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
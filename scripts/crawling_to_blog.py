@@ -1,43 +1,644 @@
 import os
-import requests
-from bs4 import BeautifulSoup
+import argparse
+import bisect
+import contextvars
+import cProfile
 import datetime
+import hashlib
+import json
+import logging
 import re
+import queue
+import sqlite3
+import random
+import signal
+import sys
+import threading
 import time
-import pyperclip
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+import unicodedata
+from collections import deque
+from contextlib import closing, contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from html import escape
+from urllib.parse import urljoin, urlsplit, parse_qs
+# requests, bs4, selenium & co. are imported where they are used, so that
+# `render` / `index` start fast and work on machines without Chrome
 
 # Configuration
 BASE_URL = "https://www.fbo.or.kr"
 LIST_URL = "https://www.fbo.or.kr/info/bbs/RepdList.do?menuId=080030&schNtceClsfCd=B01010200"
 BLOG_DIR = "blog"
+BOARD_LABEL = "보도자료"      # category label shown on the pages of this board
+VIEW_PAGE = "NoticeView.do"   # article links on the list pages point here
+DOWNLOAD_PAGE = "NoticeDownload.do"  # ... and attachment links here
 TEMPLATE_PATH = "blog_template.html"
 CHROME_DATA_DIR = r"C:\selenium\chrome_data"
 GEMINI_URL = "https://gemini.google.com/app"
+STORE_NAME = ".articles.db"  # article store and incremental crawl state (see state_path)
+MANIFEST_NAME = ".crawl-manifest.json"  # the JSON state used before the store, imported once
+CACHE_DIR = os.path.join(".cache", "http")  # raw list/article responses (see cached_get)
+STATE_DIR = os.path.join(".cache", "state")  # per-board store and search state, kept out of the published BLOG_DIR
+ATTACHMENT_DIR = "files"     # mirrored attachments, inside BLOG_DIR (see --mirror-attachments)
+DOWNLOAD_DIR = os.path.join(".cache", "downloads")  # unfinished attachment downloads
 
-def get_article_links():
-    print(f"Scanning list: {LIST_URL}")
-    all_links = []
+# Networking
+MAX_WORKERS = 4              # max concurrent requests (override with --workers)
+REQUESTS_PER_SECOND = 4.0    # per-host rate limit shared by all workers
+REQUEST_TIMEOUT = 30         # seconds
+RETRY_ATTEMPTS = 4           # retries of a request that failed transiently
+RETRY_BASE_DELAY = 1.0       # seconds; backoff doubles per attempt, with full jitter
+RETRY_MAX_DELAY = 60.0       # cap for backoff and Retry-After
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+SLOW_RESPONSE = 5.0          # seconds; slower answers count as congestion for AIMD
+PARSER_BACKEND = "html.parser"  # "html.parser", "lxml" or "selectolax" (see --parser)
+ATTACHMENT_WORKERS = 4       # concurrent attachment downloads
+DOWNLOAD_CHUNK = 64 * 1024   # bytes per read while streaming an attachment
+
+# Pipeline
+PIPELINE_BUFFER = 16         # max items waiting between two stages
+CHECKPOINT_EVERY = 20        # save manifest + index every N written articles
+RETRY_RUNS = 10              # runs that retry an article that failed before giving up on it
+
+# Watch mode
+WATCH_INTERVAL = 15.0        # seconds between two polls of page 1 (see watch_board)
+WATCH_MAX_INTERVAL = 600.0   # cap of the backoff while the list cannot be fetched
+
+# Run metrics. Stages time themselves with `metrics.timer(stage)` (seconds are
+# summed over worker threads, so a parallel stage can add up to more than the
+# wall time) and counters go through `metrics.count()`. With --log-json every
+# request and the end-of-run summary are also written as JSON lines.
+log = logging.getLogger("crawler")
+
+class JsonLogFormatter(logging.Formatter):
+    def format(self, record):
+        event = {"ts": round(record.created, 3), "event": record.getMessage()}
+        event.update(getattr(record, "fields", {}))
+        return json.dumps(event, ensure_ascii=False)
+
+def log_event(event, **fields):
+    log.info(event, extra={"fields": fields})
+
+class RunMetrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        self.stages = {}  # stage -> [calls, seconds]
+        self.counters = {}
+        self.latencies = []
+
+    @contextmanager
+    def timer(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self.lock:
+                totals = self.stages.setdefault(stage, [0, 0.0])
+                totals[0] += 1
+                totals[1] += elapsed
+
+    def count(self, name, n=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def observe_request(self, url, status, seconds, size=None):
+        with self.lock:
+            self.latencies.append(seconds)
+            if size:
+                self.counters["bytes"] = self.counters.get("bytes", 0) + size
+        log_event("request", url=url, status=status, seconds=round(seconds, 4), bytes=size)
+
+    def summary(self):
+        with self.lock:
+            elapsed = time.monotonic() - self.started
+            counters = dict(self.counters)
+            latencies = sorted(self.latencies)
+            stages = {stage: list(totals) for stage, totals in self.stages.items()}
+        articles = {name[len("articles_"):]: n for name, n in counters.items() if name.startswith("articles_")}
+        processed = sum(n for name, n in articles.items() if name != "failed")
+        latency = None
+        if latencies:
+            latency = {"mean": round(sum(latencies) / len(latencies), 4),
+                       "p50": round(latencies[len(latencies) // 2], 4),
+                       "p95": round(latencies[int(len(latencies) * 0.95)], 4),
+                       "max": round(latencies[-1], 4)}
+        cache = {}
+        for kind in ("http", "summary"):
+            hits, misses = counters.get(f"{kind}_cache_hits", 0), counters.get(f"{kind}_cache_misses", 0)
+            cache[kind] = {"hits": hits, "misses": misses,
+                           "hit_rate": round(hits / (hits + misses), 3) if hits + misses else None}
+        return {
+            "elapsed": round(elapsed, 3),
+            "articles": articles,
+            "articles_per_sec": round(processed / elapsed, 2) if elapsed else None,
+            "requests": {"count": len(latencies), "bytes": counters.get("bytes", 0),
+                         "retries": counters.get("retries", 0), "latency": latency},
+            "cache": cache,
+            "stages": {stage: {"calls": calls, "seconds": round(seconds, 3),
+                               "per_sec": round(calls / seconds, 1) if seconds else None}
+                       for stage, (calls, seconds) in sorted(stages.items(), key=lambda kv: -kv[1][1])},
+        }
+
+metrics = RunMetrics()
+
+def print_run_summary(summary):
+    requests_ = summary["requests"]
+    print(f"\nRun summary ({summary['elapsed']:.1f}s, {summary['articles_per_sec'] or 0:.2f} articles/s)")
+    print("  articles: " + (", ".join(f"{n} {name}" for name, n in sorted(summary["articles"].items())) or "none"))
+    line = f"  requests: {requests_['count']}, {requests_['bytes'] / 2**20:.2f} MB, {requests_['retries']} retries"
+    if requests_["latency"]:
+        line += ", latency p50 {p50:.3f}s p95 {p95:.3f}s max {max:.3f}s".format(**requests_["latency"])
+    print(line)
+    for kind, cache in summary["cache"].items():
+        if cache["hit_rate"] is not None:
+            print(f"  {kind} cache: {cache['hits']} hits, {cache['misses']} misses ({cache['hit_rate']:.0%})")
+    for stage, stats in summary["stages"].items():
+        print(f"  {stage:>10}: {stats['seconds']:8.2f}s over {stats['calls']} calls")
+
+# Profiling (--profile). cProfile only sees the thread it runs in, so each
+# pipeline/pool thread gets its own profiler via profiled(); they are merged
+# into one pstats dump at the end.
+_profilers = None
+_profile_local = threading.local()
+
+def profiled(func):
+    if _profilers is None:
+        return func
+    def wrapper(*args):
+        if getattr(_profile_local, "active", False):
+            return func(*args)
+        profiler = getattr(_profile_local, "profiler", None)
+        if profiler is None:
+            profiler = _profile_local.profiler = cProfile.Profile()
+            _profilers.append(profiler)
+        _profile_local.active = True
+        profiler.enable()
+        try:
+            return func(*args)
+        finally:
+            profiler.disable()
+            _profile_local.active = False
+    return wrapper
+
+class RateLimiter:
+    """Spaces out requests to the same host, no matter which thread sends them."""
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.lock = threading.Lock()
+        self.next_slot = {}
+
+    def wait(self, host):
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot.get(host, now))
+            self.next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def defer(self, host, seconds):
+        """Holds back every request to `host` for `seconds` (Retry-After)."""
+        with self.lock:
+            now = time.monotonic()
+            self.next_slot[host] = max(self.next_slot.get(host, now), now + seconds)
+
+class ConcurrencyController:
+    """
+    AIMD limit on requests in flight: it grows by one per window of healthy
+    answers and halves on a 429/5xx, a connection error or a response slower
+    than SLOW_RESPONSE (at most once per window, so one burst of failures
+    does not collapse it to 1). Never exceeds `max_limit` (--workers).
+    """
+    def __init__(self, max_limit):
+        self.cond = threading.Condition()
+        self.configure(max_limit)
+
+    def configure(self, max_limit):
+        with self.cond:
+            self.max_limit = max(max_limit, 1)
+            self.limit = float(max(self.max_limit // 2, 1))
+            self.in_flight = 0
+            self.since_decrease = 0
+            self.cond.notify_all()
+
+    def acquire(self):
+        with self.cond:
+            while self.in_flight >= int(self.limit):
+                self.cond.wait()
+            self.in_flight += 1
+
+    def release(self, congested):
+        with self.cond:
+            self.in_flight -= 1
+            self.since_decrease += 1
+            if congested:
+                if self.since_decrease >= int(self.limit):
+                    self.limit = max(self.limit / 2, 1.0)
+                    self.since_decrease = 0
+            else:
+                self.limit = min(self.limit + 1 / self.limit, float(self.max_limit))
+            self.cond.notify_all()
+
+_session = None
+_session_lock = threading.Lock()
+_rate_limiter = RateLimiter(REQUESTS_PER_SECOND)
+_controller = ConcurrencyController(MAX_WORKERS)
+
+def get_session(pool_size=MAX_WORKERS):
+    """Returns the shared keep-alive session. `pool_size` only matters on the first call."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(pool_size, 1))
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
+
+def retry_delay(attempt, response=None):
+    """Retry-After when the server sent one, else exponential backoff with full jitter."""
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after:
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            from email.utils import parsedate_to_datetime
+            try:
+                delay = (parsedate_to_datetime(retry_after) - datetime.datetime.now(datetime.timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                delay = None
+        if delay is not None:
+            return min(max(delay, 0.0), RETRY_MAX_DELAY)
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+
+def http_get(url, **kwargs):
+    """
+    GET through the shared session, respecting the per-host rate limit and the
+    adaptive concurrency limit. Request errors (connection, timeout, broken
+    body, ...) and RETRY_STATUSES are retried up to RETRY_ATTEMPTS times;
+    after that the last error is raised (an HTTPError for a status).
+    """
+    import requests
+    host = urlsplit(url).netloc
+    kwargs.setdefault("timeout", REQUEST_TIMEOUT)
+    for attempt in range(RETRY_ATTEMPTS + 1):
+        _rate_limiter.wait(host)
+        _controller.acquire()
+        response = error = None
+        start = time.perf_counter()
+        try:
+            response = get_session().get(url, **kwargs)
+        except requests.RequestException as e:
+            error = e
+        finally:
+            # Whatever happened, the slot goes back (a leaked one blocks the next caller for good)
+            elapsed = time.perf_counter() - start
+            retry = response is None or response.status_code in RETRY_STATUSES
+            _controller.release(congested=retry or elapsed > SLOW_RESPONSE)
+        if response is not None:
+            # Streamed bodies are counted by whoever reads them
+            size = None if kwargs.get("stream") else len(response.content)
+            metrics.observe_request(url, response.status_code, elapsed, size)
+        if not retry or attempt == RETRY_ATTEMPTS:
+            break
+        delay = retry_delay(attempt, response)
+        if response is not None:
+            if "Retry-After" in response.headers:
+                _rate_limiter.defer(host, delay)
+            response.close()
+        reason = error.__class__.__name__ if error else response.status_code
+        print(f"  Retrying {url} in {delay:.1f}s ({reason}, attempt {attempt + 1}/{RETRY_ATTEMPTS})")
+        metrics.count("retries")
+        log_event("retry", url=url, reason=str(reason), attempt=attempt + 1, delay=round(delay, 3))
+        time.sleep(delay)
+    if response is None:
+        raise error
+    if retry:
+        response.close()
+        response.raise_for_status()
+    return response
+
+# Incremental crawl state
+NOT_MODIFIED = object()  # fetch_article() result for a 304 answer
+
+def article_id(link):
+    """The NoticeView `ntceMngid` of a link (falls back to the link itself)."""
+    ids = parse_qs(urlsplit(link).query).get("ntceMngid")
+    return ids[0] if ids else link
+
+def response_validators(response):
+    validators = {}
+    if response.headers.get("ETag"):
+        validators["etag"] = response.headers["ETag"]
+    if response.headers.get("Last-Modified"):
+        validators["last_modified"] = response.headers["Last-Modified"]
+    return validators
+
+def article_validators(article):
+    return {k: article[k] for k in ("etag", "last_modified") if k in article}
+
+def conditional_headers(validators):
+    headers = {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+def content_hash(article):
+    """Hash of everything generate_html() renders, used to skip unchanged articles."""
+    keys = ("title", "date", "content", "url", "files")
+    payload = json.dumps({k: article[k] for k in keys}, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def _atomic_write(path, data):
+    """Writes via a temp file + rename so readers never see a half-written file."""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+# Article store: one SQLite file per board (state_path(STORE_NAME)) keyed by
+# ntceMngid. Each row holds the manifest entry (file, title, hash, validators,
+# ...) plus what the page was built from: the raw HTML, the adapted content
+# and the attachments, so `render`, `index` and `summarize` are queries
+# instead of re-crawls. articles_fts is an FTS5 trigram index over title and
+# text, kept in sync by triggers. load_manifest()/save_manifest() map the
+# store to the manifest dict the pipeline works on.
+STORE_SCHEMA = """
+PRAGMA journal_mode = WAL;
+CREATE TABLE IF NOT EXISTS articles (
+    n INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,  -- NoticeView ntceMngid
+    file TEXT, title TEXT, date TEXT, preview TEXT,
+    hash TEXT,                -- content_hash() of what the page was rendered from
+    etag TEXT, last_modified TEXT,
+    url TEXT, source_title TEXT, content TEXT, files TEXT, text TEXT,
+    raw_html TEXT, fetched_at TEXT
+);
+CREATE TABLE IF NOT EXISTS attachments (url TEXT PRIMARY KEY, path TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title, text, content='articles', content_rowid='n', tokenize='trigram');
+CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts(rowid, title, text) VALUES (new.n, new.title, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title, text) VALUES ('delete', old.n, old.title, old.text);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE OF title, text ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title, text) VALUES ('delete', old.n, old.title, old.text);
+    INSERT INTO articles_fts(rowid, title, text) VALUES (new.n, new.title, new.text);
+END;
+"""
+ENTRY_COLUMNS = ("file", "title", "date", "preview", "hash", "etag", "last_modified")
+
+def adopt_legacy_state(name):
+    """Moves a state file older versions kept in the output directory (and so published) to state_path()."""
+    legacy, path = blog_path(name), state_path(name)
+    if os.path.exists(legacy) and not os.path.exists(path):
+        for suffix in ("", "-wal", "-shm"):  # SQLite's WAL files go with the database
+            if os.path.exists(legacy + suffix):
+                os.replace(legacy + suffix, path + suffix)
+        print(f"Moved {legacy} to {path}")
+
+def open_store():
+    """Connection to the current board's store; a legacy JSON manifest is imported on first use."""
+    os.makedirs(current_board().output, exist_ok=True)
+    os.makedirs(state_path(), exist_ok=True)
+    adopt_legacy_state(STORE_NAME)
+    adopt_legacy_state(SEARCH_STATE_NAME)
+    path = state_path(STORE_NAME)
+    new = not os.path.exists(path)
+    db = sqlite3.connect(path)
+    db.row_factory = sqlite3.Row
+    db.executescript(STORE_SCHEMA)
+    legacy = blog_path(MANIFEST_NAME)
+    if new and os.path.exists(legacy):
+        with open(legacy, encoding='utf-8') as f:
+            save_manifest(db, json.load(f))
+        os.replace(legacy, legacy + ".imported")
+        print(f"Imported {MANIFEST_NAME} into {STORE_NAME}")
+    return db
+
+def load_manifest(db):
+    manifest = {"version": 1, "list": {}, "articles": {}}
+    for key, value in db.execute("SELECT key, value FROM meta"):
+        manifest[key] = json.loads(value)
+    manifest["attachments"] = dict(db.execute("SELECT url, path FROM attachments"))
+    for row in db.execute(f"SELECT id, {', '.join(ENTRY_COLUMNS)} FROM articles ORDER BY date DESC, id DESC"):
+        manifest["articles"][row["id"]] = {k: row[k] for k in ENTRY_COLUMNS if row[k] is not None}
+    return manifest
+
+def save_manifest(db, manifest):
+    """Writes `manifest` back: rows that changed are updated, articles no longer in it are deleted."""
+    articles = manifest["articles"]
+    changed = " OR ".join(f"articles.{k} IS NOT excluded.{k}" for k in ENTRY_COLUMNS)
+    with db:
+        db.executemany(
+            f"INSERT INTO articles (id, {', '.join(ENTRY_COLUMNS)}) VALUES (?{', ?' * len(ENTRY_COLUMNS)}) "
+            f"ON CONFLICT (id) DO UPDATE SET {', '.join(f'{k} = excluded.{k}' for k in ENTRY_COLUMNS)} WHERE {changed}",
+            [(aid, *(entry.get(k) for k in ENTRY_COLUMNS)) for aid, entry in articles.items()])
+        stale = [(aid,) for (aid,) in db.execute("SELECT id FROM articles") if aid not in articles]
+        db.executemany("DELETE FROM articles WHERE id = ?", stale)
+        # Unchanged rows are left alone, so a run that found nothing new does not touch the file
+        db.executemany("INSERT INTO attachments (url, path) VALUES (?, ?) "
+                       "ON CONFLICT (url) DO UPDATE SET path = excluded.path WHERE path IS NOT excluded.path",
+                       manifest.get("attachments", {}).items())
+        db.executemany("INSERT INTO meta (key, value) VALUES (?, ?) "
+                       "ON CONFLICT (key) DO UPDATE SET value = excluded.value WHERE value IS NOT excluded.value",
+                       [(key, json.dumps(value, ensure_ascii=False)) for key, value in manifest.items()
+                        if key not in ("articles", "attachments")])
+
+def store_article(db, aid, entry, data):
+    """Records a written article: its manifest entry plus the raw page and parsed data (committed with the next save_manifest)."""
+    db.execute(
+        f"INSERT INTO articles (id, {', '.join(ENTRY_COLUMNS)}, url, source_title, content, files, text, raw_html, fetched_at) "
+        f"VALUES (?{', ?' * (len(ENTRY_COLUMNS) + 7)}) ON CONFLICT (id) DO UPDATE SET "
+        + ", ".join(f"{k} = excluded.{k}" for k in ENTRY_COLUMNS + (
+            "url", "source_title", "content", "files", "text", "raw_html", "fetched_at")),
+        (aid, *(entry.get(k) for k in ENTRY_COLUMNS), data["url"], data["title"], data["content"],
+         json.dumps(data["files"], ensure_ascii=False), search_text(data["content"]), data.get("raw_html"),
+         datetime.datetime.now().isoformat(timespec="seconds")))
+
+def stored_articles(db):
+    """(id, file, article dict as parse_article() returned it) for every article with stored content."""
+    for row in db.execute("SELECT id, file, url, source_title, date, content, files FROM articles "
+                          "WHERE content IS NOT NULL ORDER BY date DESC, id DESC"):
+        yield row["id"], row["file"], {"title": row["source_title"], "date": row["date"], "content": row["content"],
+                                       "url": row["url"], "files": json.loads(row["files"])}
+
+def search_store(db, query, limit=20):
+    """
+    Rows (id, file, title, date) matching every word of `query`, best first.
+    The trigram index needs 3+ characters; shorter words are matched by a scan.
+    """
+    words = query.split()
+    long_words = [w for w in words if len(w) >= 3]
+    sql, where, params = "SELECT a.id, a.file, a.title, a.date FROM articles a", [], []
+    if long_words:
+        sql += " JOIN articles_fts ON articles_fts.rowid = a.n"
+        where.append("articles_fts MATCH ?")
+        params.append(" ".join('"' + w.replace('"', '""') + '"' for w in long_words))
+    for w in words:
+        if len(w) < 3:
+            where.append("(coalesce(a.title, '') || ' ' || coalesce(a.text, '')) LIKE ? ESCAPE '\\'")
+            params.append("%" + re.sub(r"([%_\\])", r"\\\1", w) + "%")
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += (" ORDER BY articles_fts.rank" if long_words else " ORDER BY a.date DESC, a.id DESC") + " LIMIT ?"
+    return db.execute(sql, params + [limit]).fetchall()
+
+def unique_filename(fname, aid, owners):
+    """
+    `fname`, or `<name>-<aid>.html` when another article already owns it
+    (sanitize_filename() truncates titles, so two of them can collide).
+    `owners` maps file names to article IDs and is updated.
+    """
+    if owners.setdefault(fname, aid) == aid:
+        return fname
+    stem, ext = os.path.splitext(fname)
+    fname = f"{stem}-{aid}{ext}"
+    owners[fname] = aid
+    return fname
+
+# Response cache: CACHE_DIR/blobs/<sha256 of body> + CACHE_DIR/urls/<sha256 of url>.json
+OFFLINE = False  # set by --offline: serve everything from the cache, never touch the network
+CACHED_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+class CacheMiss(Exception):
+    pass
+
+def _cache_entry_path(url):
+    return os.path.join(CACHE_DIR, "urls", hashlib.sha256(url.encode('utf-8')).hexdigest() + ".json")
+
+def _cache_store(url, response):
+    digest = hashlib.sha256(response.content).hexdigest()
+    blob_path = os.path.join(CACHE_DIR, "blobs", digest)
+    os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+    os.makedirs(os.path.join(CACHE_DIR, "urls"), exist_ok=True)
+    if not os.path.exists(blob_path):
+        _atomic_write(blob_path, response.content)
+    entry = {
+        "url": url,
+        "blob": digest,
+        "headers": {k: response.headers[k] for k in CACHED_HEADERS if k in response.headers},
+        "fetched_at": datetime.datetime.now().isoformat(timespec="seconds"),
+    }
+    _atomic_write(_cache_entry_path(url), json.dumps(entry, ensure_ascii=False))
+
+def _cache_load(url):
+    try:
+        with open(_cache_entry_path(url), encoding='utf-8') as f:
+            entry = json.load(f)
+        with open(os.path.join(CACHE_DIR, "blobs", entry["blob"]), 'rb') as f:
+            body = f.read()
+    except FileNotFoundError:
+        raise CacheMiss(url) from None
+    import requests
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response._content = body
+    response.headers.update(entry["headers"])
+    response.from_cache = True
+    return response
+
+def cached_get(url, headers=None):
+    """
+    http_get() for list and article pages: every 200 is written to the disk
+    cache, and in OFFLINE mode responses are replayed from it instead.
+    Anything but 200/304 raises requests.HTTPError.
+    """
+    if OFFLINE:
+        response = _cache_load(url)
+        metrics.count("http_cache_hits")
+        return response
+    response = http_get(url, headers=headers)
+    if response.status_code not in (200, 304):
+        # A 404 or an error page is not an empty list page / article
+        import requests
+        raise requests.HTTPError(f"{response.status_code} {response.reason} for url: {url}", response=response)
+    metrics.count("http_cache_hits" if response.status_code == 304 else "http_cache_misses")
+    if response.status_code == 200:
+        _cache_store(url, response)
+    return response
+
+def cached_article_links(known=None):
+    """
+    Links of the current board's article pages in the cache, newest ntceMngid
+    first. With `known` (IDs), only those: the cache also holds articles that
+    have since been removed from the board.
+    """
+    board = current_board()
+    board_params = {key: parse_qs(urlsplit(board.list_url).query).get(key) for key in ("menuId", "schNtceClsfCd")}
+    links = []
+    urls_dir = os.path.join(CACHE_DIR, "urls")
+    if not os.path.isdir(urls_dir):
+        return links
+    for name in os.listdir(urls_dir):
+        with open(os.path.join(urls_dir, name), encoding='utf-8') as f:
+            url = json.load(f)["url"]
+        if url.startswith(BASE_URL) and board.view_page in url:
+            params = parse_qs(urlsplit(url).query)
+            if known is not None and article_id(url) not in known:
+                continue
+            if all(params.get(key) == value for key, value in board_params.items() if value):
+                links.append(url[len(BASE_URL):])
+    return sorted(links, key=article_id, reverse=True)
+
+def iter_article_links(manifest=None, revalidate=False, scan_state=None):
+    """
+    Yields NoticeView links from the list pages, newest first, one page at a time.
+    With a manifest, page 1 is requested conditionally and, once the backfill is
+    complete, paging stops after the first page whose oldest article is known
+    (unless `revalidate`). `scan_state["complete"]` is set only if every page
+    was scanned, `scan_state["error"]` if any page failed (the rest are still
+    scanned). Page 1's validators go to `scan_state["list"]`; crawl() keeps
+    them once its articles are in. Articles that failed in an earlier run
+    (manifest["retry"]) are yielded at the end if the scan did not reach them.
+    """
+    board = current_board()
+    print(f"Scanning list: {board.list_url}")
+    found = 0
+    seen_links = set()
+    failed_pages = []
+    known_ids = manifest["articles"] if manifest else {}
+    stop_early = bool(known_ids and manifest.get("backfill_complete")) and not revalidate
+
+    def failed_before():
+        for entry in (manifest or {}).get("retry", {}).values():
+            if entry["runs"] < RETRY_RUNS and entry["link"] not in seen_links:
+                seen_links.add(entry["link"])
+                yield entry["link"]
     
     # 1. Get First Page to determine Total Pages
     try:
-        first_page_url = f"{LIST_URL}&pageIndex=1"
-        response = requests.get(first_page_url)
+        first_page_url = f"{board.list_url}&pageIndex=1"
+        headers = {}
+        if stop_early:
+            headers = conditional_headers(manifest.get("list", {}))
+        with metrics.timer("scan"):
+            response = cached_get(first_page_url, headers=headers)
+        if response.status_code == 304:
+            print("List unchanged since last run (304).")
+            yield from failed_before()
+            return
         response.encoding = 'utf-8'
-        soup = BeautifulSoup(response.text, 'html.parser')
+        backend = get_parser()
+        with metrics.timer("scan"):
+            total_text, hrefs = backend.parse_list(response.text)
+        if scan_state is not None:
+            scan_state["list"] = response_validators(response)
         
         # Find Total Pages
         total_pages = 1
-        total_span = soup.select_one("ul.m_pagination li.index span.total")
-        if total_span:
-            total_pages = int(total_span.get_text(strip=True))
+        if total_text is not None:
+            total_pages = int(total_text)
             print(f"Total pages detected: {total_pages}")
         else:
             print("Could not detect total pages. Defaulting to 1.")
@@ -45,70 +646,65 @@ def get_article_links():
         # 2. Iterate all pages
         for page in range(1, total_pages + 1):
             print(f"Scanning Page {page}/{total_pages}...")
-            page_url = f"{LIST_URL}&pageIndex={page}"
+            page_url = f"{board.list_url}&pageIndex={page}"
             
-            # Avoid re-fetching page 1 if we just did it? 
-            # It's fine to re-fetch or use logic. Simple re-fetch is robust.
+            # Page 1 was already fetched above
             if page > 1:
-                response = requests.get(page_url)
-                response.encoding = 'utf-8'
-                soup = BeautifulSoup(response.text, 'html.parser')
+                try:
+                    with metrics.timer("scan"):
+                        response = cached_get(page_url)
+                        response.encoding = 'utf-8'
+                        _, hrefs = backend.parse_list(response.text)
+                except Exception as e:
+                    # The other pages are still worth scanning, but the scan is not complete
+                    print(f"  Error scanning page {page}: {e}")
+                    failed_pages.append(page)
+                    continue
 
-            items = soup.select("td.subject > a")
             page_links = []
-            for item in items:
-                href = item.get('href')
-                if href and 'NoticeView.do' in href:
-                    full_link = f"/info/bbs/{href}"
-                    # Deduplicate if needed, but list usually unique
-                    page_links.append(full_link)
+            for href in hrefs:
+                if href and board.view_page in href:
+                    # Relative to the list page; kept as a path (download_article adds BASE_URL)
+                    parts = urlsplit(urljoin(board.list_url, href))
+                    full_link = f"{parts.path}?{parts.query}"
+                    # Posts shift down while we page (or between cached pages)
+                    if full_link not in seen_links:
+                        seen_links.add(full_link)
+                        page_links.append(full_link)
             
             print(f"  Found {len(page_links)} articles on page {page}.")
-            all_links.extend(page_links)
-            
-            # Nice delay to be polite
-            time.sleep(0.5)
+
+            # Boards are newest-first: once the oldest article on a page is known, so
+            # is everything after it (pinned posts sit at the top, so not the first)
+            if stop_early and all(article_id(l) in known_ids for l in page_links):
+                print("  Nothing new on this page, stopping.")
+                break
+            found += len(page_links)
+            yield from page_links
+            if stop_early and page_links and article_id(page_links[-1]) in known_ids:
+                break
+        else:
+            if scan_state is not None and not failed_pages:
+                scan_state["complete"] = True
+        yield from failed_before()
             
-        print(f"Total articles found: {len(all_links)}")
-        return all_links
+        print(f"Total articles found: {found}")
+        if failed_pages:
+            raise IOError(f"could not scan page(s) {', '.join(map(str, failed_pages))}")
 
     except Exception as e:
         print(f"Error scanning list: {e}")
-        return []
+        if scan_state is not None:
+            scan_state["error"] = e
+
+def get_article_links(manifest=None, revalidate=False):
+    return list(iter_article_links(manifest, revalidate))
 
 def adapt_text(raw_text):
     # (Leaving adapt_text as is, but it might be unused if adapt_content_node is used?)
     # ... logic unchanged ...
     return raw_text 
 
-# ... (Previous adapt_content_node and fetch_article functions remain) ...
-
-def main():
-    generated_list = []
-    print("Starting crawler...")
-    
-    target_links = get_article_links()
-    
-    # Remove LIMIT: Process ALL links
-    for i, link in enumerate(target_links): 
-        print(f"Processing ({i+1}/{len(target_links)}): {link}")
-        data = fetch_article(link)
-        if data:
-            fname = generate_html(data)
-            display_title = data['title'].replace('[보도자료]', '').strip()
-            preview = re.sub(r'<[^>]+>', '', data['content'])[:60] + "..."
-            generated_list.append((fname, display_title, data['date'], preview))
-        
-        # Save index checkpoint every 20 articles? Or just at end?
-        # For safety, let's just do it at the end for now, or maybe update in chunks?
-        
-    if generated_list:
-        update_index(generated_list)
-        print("Success! Generated blog posts.")
-
-if __name__ == "__main__":
-    main()
-
 def sanitize_filename(title):
     # Remove special chars, replace spaces with hyphens
     clean = re.sub(r'[\\/*?:"<>|]', '', title)
@@ -117,160 +713,454 @@ def sanitize_filename(title):
 
 
 
-def adapt_content_node(content_node):
+# Content rules. Highlights are compiled into one alternation and applied in a
+# single pass per block; earlier rules win when two could match at the same spot.
+HIGHLIGHT_RULES = [
+    # (name, pattern, replacement)
+    ("date", r'\d{4}[-.]\d{1,2}[-.]\d{1,2}|\d{4}년\s?\d{1,2}월\s?\d{1,2}일', '<span class="highlight-green">{}</span>'),
+    ("amount", r'\d+(?:,\d{3})*원', '<span class="highlight-green">{}</span>'),
+    ("percent", r'\d+(?:\.\d+)?%', '<span class="highlight-green">{}</span>'),
+]
+HIGHLIGHT_ANCHOR = r'\d'  # every rule starts with a digit, so other positions are skipped quickly
+# Very common bullets in Korean Gov docs
+HEADER_PREFIXES = ('□', '○', 'ㅇ', 'o', '-', '1.', '[', '<')
+HEADER_BULLET_STRIP = r'^[\□\○\ㅇ\-\1\.\s]+'
+# Short blocks that don't end like a sentence are usually titles
+HEADER_MAX_LEN = 40
+SENTENCE_ENDINGS = ('.', ',')
+
+def compile_highlighter(rules, anchor=None):
     """
-    Parses the BeautifulSoup content node to extract structure:
-    - Intro (First paragraph)
-    - Subheadings (Bold text, or lines starting with □, ○, -, <)
-    - Body (Regular text)
-    Returns: HTML string with <div class="intro-box">, <h3>, <p>
+    Compiles (name, pattern, replacement) rules into one function: str -> str.
+    `anchor` is an optional lookahead every match must start with.
     """
-    if not content_node:
-        return ""
-        
-    final_html = ""
-    
-    # Strategy: Iterate through significant child elements (p, div) or split by <br>
-    # Since structure varies, we'll try to process 'blocks' of text.
-    # We will look for structural markers in text AND HTML tags (strong/b).
-    
-    # 1. Get textual blocks (mixed with relevant tags)
-    # We'll use a simplified approach: process text lines but check for 'strong' parents
-    
-    lines = []
-    # Using 'decode_contents' to get inner HTML, then split by <br> or </p> is one way.
-    # An easier way using BS4: iterate over strings and tags?
-    # Let's clean it up:
-    
+    alternation = "|".join(f"(?P<{name}>{regex})" for name, regex, _ in rules)
+    if anchor:
+        alternation = f"(?={anchor})(?:{alternation})"
+    pattern = re.compile(alternation)
+    replacements = {name: repl for name, _, repl in rules}
+    if len(set(replacements.values())) == 1:
+        # Same markup for every rule: let re expand a template instead of calling back into Python
+        template = next(iter(replacements.values())).replace('\\', '\\\\').replace('{}', '\\g<0>')
+        return lambda text: pattern.sub(template, text)
+    def replace(match):
+        return replacements[match.lastgroup].format(match.group())
+    return lambda text: pattern.sub(replace, text)
+
+highlight = compile_highlighter(HIGHLIGHT_RULES, HIGHLIGHT_ANCHOR)
+_bullet_strip_re = re.compile(HEADER_BULLET_STRIP)
+
+def content_blocks(content_node):
+    """Splits the BeautifulSoup content node into stripped, non-empty text blocks."""
     # Convert <br> to newlines to distinct blocks
     for br in content_node.find_all("br"):
         br.replace_with("\n")
         
     # Get text blocks (splitting by newlines we just made + natural block elements)
     text = content_node.get_text("\n")
-    raw_blocks = [line.strip() for line in text.split('\n') if line.strip()]
-    
+    return [line.strip() for line in text.split('\n') if line.strip()]
+
+def adapt_blocks(raw_blocks):
+    """
+    Classifies text blocks into intro / subheadings / body:
+    - Intro (First block)
+    - Subheadings (lines starting with □, ○, -, <, or short non-sentences)
+    - Body (Regular text)
+    Returns: HTML string with <div class="intro-box">, <h3>, <p>
+    """
     if not raw_blocks:
         return ""
 
-    # Phase 2: Classification
-    # First block -> Intro (unless it's a date or meta info? Press releases usually start with title or intro)
-    # But usually Title is separate. So first block is Intro.
-    
-    intro_done = False
-    
-    for i, block in enumerate(raw_blocks):
-        # 1. Detect Intro (First valid block)
-        if not intro_done:
-            # Highlight key info in Intro
-            block = re.sub(r'(\d{4}[-.]\d{1,2}[-.]\d{1,2}|\d{4}년\s?\d{1,2}월\s?\d{1,2}일)', r'<span class="highlight-green">\1</span>', block)
-            block = re.sub(r'(\d+(?:,\d{3})*원|\d+(?:\.\d+)?%)', r'<span class="highlight-green">\1</span>', block)
-            
-            final_html += f'<div class="intro-box"><span class="intro-label">요약</span>{block}</div>\n'
-            intro_done = True
-            continue
+    # First block -> Intro (press releases keep the title separate, so it's the lead)
+    parts = [f'<div class="intro-box"><span class="intro-label">요약</span>{highlight(raw_blocks[0])}</div>\n']
 
-        # 2. Detect Header vs Body
-        is_header = False
-        
-        # Heuristic 1: Special Bullets (Very common in Korean Gov docs)
-        if block.startswith(('□', '○', 'ㅇ', 'o', '-', '1.', '[', '<')):
-            is_header = True
-            # Clean bullet for display
-            clean_text = re.sub(r'^[\□\○\ㅇ\-\1\.\s]+', '', block).strip()
+    for block in raw_blocks[1:]:
+        # Heuristic 1: Special Bullets (clean the bullet for display)
+        if block.startswith(HEADER_PREFIXES):
+            parts.append(f"<h3>{_bullet_strip_re.sub('', block).strip()}</h3>\n")
+        # Heuristic 2: Short length + Ends without punctuation (often a title)
+        elif len(block) < HEADER_MAX_LEN and not block.endswith(SENTENCE_ENDINGS):
+            parts.append(f"<h3>{block}</h3>\n")
         else:
-            clean_text = block
+            # Body Formatting: Highlight logic + Sentence Break on every period followed by space
+            parts.append(f"<p>{highlight(block).replace('. ', '.<br>')}</p>\n")
 
-        # Heuristic 2: Short length + Ends without punctuation (often a title)
-        if len(block) < 40 and not block.endswith(('.', ',')):
-             is_header = True
+    return "".join(parts)
 
-        # Render
-        if is_header:
-            final_html += f"<h3>{clean_text}</h3>\n"
-        else:
-            # Body Formatting: Highlight logic + Sentence Break
-            body_text = block
-            body_text = re.sub(r'(\d{4}[-.]\d{1,2}[-.]\d{1,2}|\d{4}년\s?\d{1,2}월\s?\d{1,2}일)', r'<span class="highlight-green">\1</span>', body_text)
-            body_text = re.sub(r'(\d+(?:,\d{3})*원|\d+(?:\.\d+)?%)', r'<span class="highlight-green">\1</span>', body_text)
-            
-            # Sentence splitting for readability
-            # Strict Sentence splitting: Break on every period followed by space
-            body_text = body_text.replace('. ', '.<br>')
-            
-            final_html += f"<p>{body_text}</p>\n"
-            
-    return final_html
+def adapt_content_node(content_node):
+    """
+    Parses the BeautifulSoup content node to extract structure (see adapt_blocks).
+    Returns: HTML string with <div class="intro-box">, <h3>, <p>
+    """
+    if not content_node:
+        return ""
+    return adapt_blocks(content_blocks(content_node))
+
+# Boards. Each board has its own list URL, selectors, output directory (with
+# its own manifest, index and search index) and category label; --boards reads
+# several from a JSON file (see load_boards). Code reads the board being crawled
+# from current_board(), which is the board made of the constants above unless
+# a board is set for the current thread (pipeline threads inherit it).
+DEFAULT_SELECTORS = {
+    "list_link": "td.subject > a",
+    "total_pages": "ul.m_pagination li.index span.total",
+    "title": "div.viewTit > h4",
+    "meta": "div.viewTit ul",
+    "content": "div.viewContent",
+    "files": "div.viewFile",
+    "file_links": "dd.fileName a",
+}
+
+class Board:
+    def __init__(self, name, list_url, output, label, selectors=None,
+                 view_page=VIEW_PAGE, download_page=DOWNLOAD_PAGE, pinned=False):
+        self.name = name
+        self.list_url = list_url
+        self.output = output
+        self.label = label
+        self.selectors = dict(DEFAULT_SELECTORS, **(selectors or {}))
+        self.view_page = view_page
+        self.download_page = download_page
+        self.pinned = pinned  # show PINNED_CARDS on the front page
+
+_board = contextvars.ContextVar("board", default=None)
+
+def current_board():
+    return _board.get() or Board("default", LIST_URL, BLOG_DIR, BOARD_LABEL, pinned=True)
 
-def fetch_article(url):
+def blog_path(*parts):
+    """Path inside the current board's output directory."""
+    return os.path.join(current_board().output, *parts)
+
+def state_path(*parts):
+    """Path inside the current board's state directory: STATE_DIR/<output path>, outside the output."""
+    key = re.sub(r'[^\w.-]+', '_', os.path.normpath(current_board().output)).strip('_')
+    return os.path.join(STATE_DIR, key, *parts)
+
+def bind_board(func):
+    """Wraps `func` to run with the caller's board in whichever thread calls it."""
+    board = _board.get()
+    if board is None:
+        return func
+    def wrapper(*args):
+        token = _board.set(board)
+        try:
+            return func(*args)
+        finally:
+            _board.reset(token)
+    return wrapper
+
+def load_boards(path):
+    """
+    Reads a boards file: {"boards": [{"name", "list_url", "output", "label",
+    "selectors", "view_page", "download_page", "pinned"}, ...]}. Only name,
+    list_url and output are required; selectors override DEFAULT_SELECTORS.
+    Outputs sit next to each other (pages link to ../style.css).
+    """
+    with open(path, encoding='utf-8') as f:
+        config = json.load(f)
+    boards = []
+    for spec in config["boards"]:
+        missing = [key for key in ("name", "list_url", "output") if key not in spec]
+        if missing:
+            raise ValueError(f"board {spec.get('name', len(boards) + 1)} is missing {', '.join(missing)}")
+        unknown = set(spec.get("selectors", {})) - set(DEFAULT_SELECTORS)
+        if unknown:
+            raise ValueError(f"board {spec['name']}: unknown selectors {', '.join(sorted(unknown))}")
+        boards.append(Board(spec["name"], spec["list_url"], spec["output"], spec.get("label", spec["name"]),
+                            spec.get("selectors"), spec.get("view_page", VIEW_PAGE),
+                            spec.get("download_page", DOWNLOAD_PAGE), spec.get("pinned", False)))
+    if len({board.output for board in boards}) < len(boards):
+        raise ValueError("every board needs its own output directory")
+    return boards
+
+def display_title(title):
+    return title.replace(f'[{current_board().label}]', '').strip()
+
+# Parser backends. All of them return plain data, so the rest of the crawler
+# doesn't care which engine produced it; output is identical across backends.
+# SoupStrainer arguments for the nodes the default selectors read
+LIST_NODES = (["td", "ul"], ["subject", "m_pagination"])
+ARTICLE_NODES = ("div", ["viewTit", "viewContent", "viewFile"])
+
+def _uses_default(selectors, keys):
+    return all(selectors[key] == DEFAULT_SELECTORS[key] for key in keys)
+
+class SoupBackend:
+    """
+    BeautifulSoup with `features` ("html.parser" or "lxml"), building only the
+    nodes we read (custom selectors fall back to parsing the whole page).
+    """
+    def __init__(self, features, selectors=DEFAULT_SELECTORS):
+        from bs4 import BeautifulSoup, SoupStrainer
+        self.soup = BeautifulSoup
+        self.features = features
+        self.selectors = selectors
+        self.list_only = SoupStrainer(LIST_NODES[0], class_=LIST_NODES[1]) if _uses_default(
+            selectors, ("list_link", "total_pages")) else None
+        self.article_only = SoupStrainer(ARTICLE_NODES[0], class_=ARTICLE_NODES[1]) if _uses_default(
+            selectors, ("title", "meta", "content", "files", "file_links")) else None
+
+    def parse_list(self, html):
+        """Returns (total pages text or None, hrefs of the article links)."""
+        soup = self.soup(html, self.features, parse_only=self.list_only)
+        total_span = soup.select_one(self.selectors["total_pages"])
+        total = total_span.get_text(strip=True) if total_span else None
+        return total, [a.get('href') for a in soup.select(self.selectors["list_link"])]
+
+    def parse_article(self, html):
+        """Returns {"title", "meta", "blocks", "files"}; missing nodes are None."""
+        soup = self.soup(html, self.features, parse_only=self.article_only)
+        title_node = soup.select_one(self.selectors["title"])
+        meta_node = soup.select_one(self.selectors["meta"])
+        content_node = soup.select_one(self.selectors["content"])
+        files = []
+        file_node = soup.select_one(self.selectors["files"])
+        if file_node:
+            links = file_node.select(self.selectors["file_links"])
+            if not links: links = file_node.select("a")
+            files = [(link.get('href'), link.get_text(strip=True)) for link in links]
+        return {
+            "title": title_node.get_text(strip=True) if title_node else None,
+            "meta": meta_node.get_text() if meta_node else None,
+            "blocks": content_blocks(content_node) if content_node else None,
+            "files": files,
+        }
+
+class SelectolaxBackend:
+    """selectolax (lexbor): a C parser, several times faster than BeautifulSoup."""
+    def __init__(self, selectors=DEFAULT_SELECTORS):
+        from selectolax.lexbor import LexborHTMLParser
+        self.parser = LexborHTMLParser
+        self.selectors = selectors
+
+    def parse_list(self, html):
+        tree = self.parser(html)
+        total_span = tree.css_first(self.selectors["total_pages"])
+        total = total_span.text(strip=True) if total_span else None
+        return total, [a.attributes.get('href') for a in tree.css(self.selectors["list_link"])]
+
+    def parse_article(self, html):
+        tree = self.parser(html)
+        title_node = tree.css_first(self.selectors["title"])
+        meta_node = tree.css_first(self.selectors["meta"])
+        content_node = tree.css_first(self.selectors["content"])
+        blocks = None
+        if content_node:
+            # BeautifulSoup's get_text() skips these, so drop them to match
+            content_node.strip_tags(["script", "style", "template"])
+            text = content_node.text(separator="\n")
+            blocks = [line.strip() for line in text.split('\n') if line.strip()]
+        files = []
+        file_node = tree.css_first(self.selectors["files"])
+        if file_node:
+            links = file_node.css(self.selectors["file_links"]) or file_node.css("a")
+            files = [(link.attributes.get('href'), link.text(strip=True)) for link in links]
+        return {
+            "title": title_node.text(strip=True) if title_node else None,
+            "meta": meta_node.text() if meta_node else None,
+            "blocks": blocks,
+            "files": files,
+        }
+
+PARSER_BACKENDS = {
+    "html.parser": lambda selectors: SoupBackend("html.parser", selectors),
+    "lxml": lambda selectors: SoupBackend("lxml", selectors),
+    "selectolax": SelectolaxBackend,
+}
+_parsers = {}
+
+def get_parser(name=None):
+    """The (cached) backend called `name` (PARSER_BACKEND by default) for the current board's selectors."""
+    name = name or PARSER_BACKEND
+    selectors = current_board().selectors
+    key = (name, tuple(sorted(selectors.items())))
+    if key not in _parsers:
+        _parsers[key] = PARSER_BACKENDS[name](selectors)
+    return _parsers[key]
+
+def download_article(url, validators=None):
+    """
+    Fetch stage: returns {"url", "html", etag/last_modified}, None on failure,
+    or NOT_MODIFIED when the server answers a conditional request with 304.
+    """
     full_url = BASE_URL + url
     print(f"Fetching: {full_url}")
     try:
-        response = requests.get(full_url)
+        response = cached_get(full_url, headers=conditional_headers(validators or {}))
+        if response.status_code == 304:
+            return NOT_MODIFIED
         response.encoding = 'utf-8'
-        soup = BeautifulSoup(response.text, 'html.parser')
+        return {"url": full_url, "html": response.text, **response_validators(response)}
+    except Exception as e:
+        print(f"Error fetching {url}: {e}")
+        return None
+
+def fetch_article(url, validators=None):
+    """Returns the article dict, None on failure, or NOT_MODIFIED (see download_article)."""
+    page = download_article(url, validators)
+    if page is None or page is NOT_MODIFIED:
+        return page
+    return parse_article(page)
+
+def parse_article(page):
+    """Parse stage: turns a download_article() page into the article dict."""
+    full_url = page["url"]
+    try:
+        fields = get_parser().parse_article(page["html"])
         
-        title_node = soup.select_one("div.viewTit > h4")
-        title_text = title_node.get_text(strip=True) if title_node else "제목 없음"
+        title_text = fields["title"] if fields["title"] is not None else "제목 없음"
         
         if title_text == "제목 없음":
             return None
             
         # Extract Date
         date_text = datetime.date.today().strftime("%Y.%m.%d") # Default
-        view_tit_ul = soup.select_one("div.viewTit ul")
-        if view_tit_ul:
-            text_content = view_tit_ul.get_text()
-            match = re.search(r'(\d{4}-\d{2}-\d{2})', text_content)
+        if fields["meta"] is not None:
+            match = re.search(r'(\d{4}-\d{2}-\d{2})', fields["meta"])
             if match:
                 date_text = match.group(1).replace('-', '.')
         
-        content_node = soup.select_one("div.viewContent")
-        if content_node:
-            # NEW: Pass the Node itself to easier extraction logic (or just text extraction with BR handling)
-            # The new adapt_content_node handles <br> to \n conversion internally
-            adapted_html = adapt_content_node(content_node)
+        if fields["blocks"] is not None:
+            adapted_html = adapt_blocks(fields["blocks"])
         else:
             adapted_html = "<p>내용을 가져올 수 없습니다.</p>"
             
         # File Attachment scraping
         files = []
-        file_node = soup.select_one("div.viewFile")
-        if file_node:
-            links = file_node.select("dd.fileName a")
-            if not links: links = file_node.select("a")
-            for link in links:
-                file_href = link.get('href')
-                file_name = link.get_text(strip=True)
-                if file_href and "NoticeDownload" in file_href:
-                    full_file_url = f"https://www.fbo.or.kr/info/bbs/{file_href}"
-                    files.append({"name": file_name, "url": full_file_url})
+        for file_href, file_name in fields["files"]:
+            if file_href and current_board().download_page in file_href:
+                full_file_url = urljoin(full_url, file_href)
+                files.append({"name": file_name, "url": full_file_url})
 
         return {
             "title": title_text,
             "content": adapted_html,
             "date": date_text,
             "url": full_url,
-            "files": files
+            "files": files,
+            **article_validators(page)
         }
     except Exception as e:
-        print(f"Error fetching {url}: {e}")
+        print(f"Error parsing {full_url}: {e}")
         return None
 
-def generate_html(article):
-    display_title = article['title'].replace('[보도자료]', '').strip()
-    safe_filename = sanitize_filename(display_title) + ".html"
-    filepath = os.path.join(BLOG_DIR, safe_filename)
-    
-    # File Block HTML
-    file_html = ""
-    if article['files']:
-        file_html += '<div class="file-download-box"><h4>첨부파일</h4><ul>'
-        for f in article['files']:
-             file_html += f'<li><a href="{f["url"]}" target="_blank">📄 {f["name"]}</a></li>'
-        file_html += '</ul></div>'
+# Attachment mirroring. Files are stored once per content hash as
+# BLOG_DIR/ATTACHMENT_DIR/<sha256>.<ext>; downloads stream into DOWNLOAD_DIR
+# first and a broken one is resumed with a Range request on the next try.
+_download_locks = {}
+_download_locks_guard = threading.Lock()
+
+def _download_lock(url):
+    with _download_locks_guard:
+        return _download_locks.setdefault(url, threading.RLock())
+
+def attachment_extension(name):
+    ext = os.path.splitext(name or "")[1].lower()
+    return ext if re.fullmatch(r'\.[a-z0-9]{1,8}', ext) else ""
+
+def download_attachment(url, name):
+    """
+    Streams `url` to disk and returns its path relative to BLOG_DIR. A partial
+    file left by an earlier attempt is resumed when the server honours Range.
+    """
+    os.makedirs(DOWNLOAD_DIR, exist_ok=True)
+    partial = os.path.join(DOWNLOAD_DIR, hashlib.sha256(url.encode('utf-8')).hexdigest() + ".partial")
+    with _download_lock(url):
+        digest = hashlib.sha256()
+        offset = 0
+        if os.path.exists(partial):
+            with open(partial, 'rb') as f:
+                for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK), b""):
+                    digest.update(chunk)
+                    offset += len(chunk)
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        with http_get(url, headers=headers, stream=True) as response:
+            if response.status_code == 416:
+                # Stale partial (the file changed or shrank): start over
+                os.remove(partial)
+                return download_attachment(url, name)
+            response.raise_for_status()
+            if response.status_code != 206:
+                digest, offset = hashlib.sha256(), 0
+            expected = response.headers.get("Content-Length")
+            received = 0
+            with open(partial, 'ab' if offset else 'wb') as f:
+                for chunk in response.iter_content(DOWNLOAD_CHUNK):
+                    f.write(chunk)
+                    digest.update(chunk)
+                    received += len(chunk)
+            metrics.count("bytes", received)
+            if expected is not None and received < int(expected):
+                raise IOError(f"incomplete download ({offset + received} bytes), will resume")
+        rel_path = f"{ATTACHMENT_DIR}/{digest.hexdigest()}{attachment_extension(name)}"
+        target = blog_path(ATTACHMENT_DIR, os.path.basename(rel_path))
+        if os.path.exists(target):
+            os.remove(partial)  # same content already mirrored
+        else:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(partial, target)
+        return rel_path
+
+def mirror_attachments(files, known):
+    """
+    Returns `files` with a "local" path for every attachment that is mirrored.
+    `known` maps attachment URLs to paths from earlier runs; failed downloads
+    keep linking to fbo.or.kr.
+    """
+    mirrored = []
+    for f in files:
+        local = known.get(f["url"])
+        if not (local and os.path.exists(blog_path(local))):
+            local = None
+            if not OFFLINE:
+                try:
+                    local = download_attachment(f["url"], f["name"])
+                    print(f"  Mirrored: {f['name']} -> {local}")
+                except Exception as e:
+                    print(f"  Error mirroring {f['url']}: {e}")
+        mirrored.append(dict(f, local=local) if local else f)
+    return mirrored
+
+# Article page template. Placeholders are {{name}}; the template is compiled
+# once at import and rendered per article by joining precomputed pieces.
+ARTICLE_CSS_NAME = "article.css"  # shared stylesheet, written under a fingerprinted name by write_assets()
+ARTICLE_CSS = """.article-container { max-width: 680px; margin: 0 auto; padding: 40px 24px; }
+
+/* Header Styling */
+.article-header { border-bottom: 1px solid var(--color-border); padding-bottom: 30px; margin-bottom: 30px; }
+.article-title { font-size: 2rem; font-weight: 800; line-height: 1.4; margin-top: 10px; word-break: keep-all; letter-spacing: -0.02em; color: var(--color-text-main); }
+.article-meta { color: var(--color-text-sub); margin-top: 16px; font-size: 0.95rem; }
+
+/* Navigation Button */
+.btn-list { display: inline-flex; align-items: center; padding: 10px 16px; background-color: var(--color-surface); border: 1px solid var(--color-border); border-radius: 8px; color: var(--color-text-sub); text-decoration: none; font-weight: 600; transition: all 0.2s; font-size: 0.9rem; }
+.btn-list:hover { background-color: var(--color-bg); color: var(--color-text-main); border-color: var(--color-text-sub); }
+
+/* Body Typography */
+.article-body { font-size: 1.15rem; line-height: 1.8; color: var(--color-text-main); word-break: keep-all; }
+.highlight-green { color: var(--color-primary); font-weight: 700; background-color: rgba(0, 135, 68, 0.08); padding: 0 4px; border-radius: 4px; }
+
+/* Intro Box & Ads */
+.intro-box { background: var(--color-surface); padding: 24px; border-radius: 16px; margin-bottom: 50px; border: 1px solid var(--color-primary); position: relative; box-shadow: 0 4px 12px rgba(0,0,0,0.03); }
+.intro-label { background: var(--color-primary); color: white; padding: 6px 14px; border-radius: 20px; font-size: 0.85rem; font-weight: 700; position: absolute; top: -14px; left: 24px; }
+.ad-wrapper { margin: 15px 0; padding: 10px 0; background: var(--color-bg); border-radius: 8px; }
+
+/* Headers & Spacing */
+.article-body h3 { font-size: 1.5rem; margin: 60px 0 24px; border-left: 5px solid var(--color-primary); padding-left: 18px; color: var(--color-text-main); font-weight: 800; line-height: 1.3; }
+.article-body p { margin-bottom: 28px; }
+
+.file-download-box { background: var(--color-surface-lighter); padding: 24px; border-radius: 12px; margin-top: 40px; border: 1px solid var(--color-border); }
+.file-download-box h4 { font-size: 1.1rem; margin-bottom: 16px; color: var(--color-text-sub); font-weight: 700; }
+.file-download-box ul { list-style: none; padding: 0; }
+.file-download-box li { margin-bottom: 12px; }
+.file-download-box a { color: var(--color-primary); text-decoration: none; font-weight: 600; display: flex; align-items: center; gap: 10px; padding: 8px 0; }
+.file-download-box a:hover { text-decoration: underline; }
 
-    ad_block = """
+.original-link { display: block; margin-top: 60px; padding: 18px; background: var(--color-surface); border-radius: 12px; color: var(--color-text-main); text-decoration: none; font-weight: 600; text-align: center; border: 1px solid var(--color-border); transition: background 0.2s; font-size: 1.1rem; }
+.original-link:hover { background: var(--color-bg); }
+"""
+
+AD_BLOCK = """
 <div class="ad-wrapper">
 <center>
 <ins class="adsbygoogle"
@@ -284,13 +1174,39 @@ def generate_html(article):
 </script>
 </center></div>
     """
-    
-    html_content = f"""<!DOCTYPE html>
+
+_placeholder_re = re.compile(r'\{\{(\w+)\}\}')
+
+def compile_template(source, **constants):
+    """
+    Splits `source` at its {{name}} placeholders once, filling in `constants`
+    right away. Returns render(**fields) -> str.
+    """
+    pieces = _placeholder_re.split(source)  # literal, name, literal, name, ..., literal
+    literals, names = [], []
+    buffer = pieces[0]
+    for name, literal in zip(pieces[1::2], pieces[2::2]):
+        if name in constants:
+            buffer += constants[name] + literal
+        else:
+            literals.append(buffer)
+            names.append(name)
+            buffer = literal
+    literals.append(buffer)
+    def render(**fields):
+        out = [literals[0]]
+        for name, literal in zip(names, literals[1:]):
+            out.append(fields[name])
+            out.append(literal)
+        return "".join(out)
+    return render
+
+render_article_page = compile_template("""<!DOCTYPE html>
 <html lang="ko">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{display_title} | 농지연금 블로그</title>
+    <title>{{title}} | 농지연금 블로그</title>
     
     <link rel="icon" type="image/png" href="../favicon.png">
     <link rel="apple-touch-icon" href="../favicon.png">
@@ -299,100 +1215,459 @@ def generate_html(article):
      crossorigin="anonymous"></script>
 
     <link rel="stylesheet" href="../style.css">
-    <style>
-        .article-container {{ max-width: 680px; margin: 0 auto; padding: 40px 24px; }}
-        
-        /* Header Styling */
-        .article-header {{ border-bottom: 1px solid var(--color-border); padding-bottom: 30px; margin-bottom: 30px; }}
-        .article-title {{ font-size: 2rem; font-weight: 800; line-height: 1.4; margin-top: 10px; word-break: keep-all; letter-spacing: -0.02em; color: var(--color-text-main); }}
-        .article-meta {{ color: var(--color-text-sub); margin-top: 16px; font-size: 0.95rem; }}
-        
-        /* Navigation Button */
-        .btn-list {{ display: inline-flex; align-items: center; padding: 10px 16px; background-color: var(--color-surface); border: 1px solid var(--color-border); border-radius: 8px; color: var(--color-text-sub); text-decoration: none; font-weight: 600; transition: all 0.2s; font-size: 0.9rem; }}
-        .btn-list:hover {{ background-color: var(--color-bg); color: var(--color-text-main); border-color: var(--color-text-sub); }}
-        
-        /* Body Typography */
-        .article-body {{ font-size: 1.15rem; line-height: 1.8; color: var(--color-text-main); word-break: keep-all; }}
-        .highlight-green {{ color: var(--color-primary); font-weight: 700; background-color: rgba(0, 135, 68, 0.08); padding: 0 4px; border-radius: 4px; }}
-        
-        /* Intro Box & Ads */
-        .intro-box {{ background: var(--color-surface); padding: 24px; border-radius: 16px; margin-bottom: 50px; border: 1px solid var(--color-primary); position: relative; box-shadow: 0 4px 12px rgba(0,0,0,0.03); }}
-        .intro-label {{ background: var(--color-primary); color: white; padding: 6px 14px; border-radius: 20px; font-size: 0.85rem; font-weight: 700; position: absolute; top: -14px; left: 24px; }}
-        .ad-wrapper {{ margin: 15px 0; padding: 10px 0; background: var(--color-bg); border-radius: 8px; }}
-
-        /* Headers & Spacing */
-        .article-body h3 {{ font-size: 1.5rem; margin: 60px 0 24px; border-left: 5px solid var(--color-primary); padding-left: 18px; color: var(--color-text-main); font-weight: 800; line-height: 1.3; }}
-        .article-body p {{ margin-bottom: 28px; }}
-        
-        .file-download-box {{ background: var(--color-surface-lighter); padding: 24px; border-radius: 12px; margin-top: 40px; border: 1px solid var(--color-border); }}
-        .file-download-box h4 {{ font-size: 1.1rem; margin-bottom: 16px; color: var(--color-text-sub); font-weight: 700; }}
-        .file-download-box ul {{ list-style: none; padding: 0; }}
-        .file-download-box li {{ margin-bottom: 12px; }}
-        .file-download-box a {{ color: var(--color-primary); text-decoration: none; font-weight: 600; display: flex; align-items: center; gap: 10px; padding: 8px 0; }}
-        .file-download-box a:hover {{ text-decoration: underline; }}
-        
-        .original-link {{ display: block; margin-top: 60px; padding: 18px; background: var(--color-surface); border-radius: 12px; color: var(--color-text-main); text-decoration: none; font-weight: 600; text-align: center; border: 1px solid var(--color-border); transition: background 0.2s; font-size: 1.1rem; }}
-        .original-link:hover {{ background: var(--color-bg); }}
-    </style>
+    <link rel="stylesheet" href="{{css}}">
 </head>
 <body>
     <div class="article-container">
         <a href="./" class="btn-list">← 목록으로</a>
         <header class="article-header">
 
-            <h1 class="article-title">{display_title}</h1>
-            <div class="article-meta">{article['date']} · 보도자료 요약</div>
+            <h1 class="article-title">{{title}}</h1>
+            <div class="article-meta">{{date}} · {{label}} 요약</div>
         </header>
         
-        {ad_block}
+        {{ad}}
         
         <div class="article-body">
-            {article['content']}
+            {{content}}
         </div>
         
-        {file_html}
+        {{files}}
         
-        {ad_block}
+        {{ad}}
 
-        <a href="{article['url']}" class="original-link">원문 보러가기 →</a>
+        <a href="{{url}}" class="original-link">원문 보러가기 →</a>
     </div>
      <script>
-        if(localStorage.getItem('theme') === 'dark') {{
+        if(localStorage.getItem('theme') === 'dark') {
             document.body.classList.add('dark-mode');
-        }}
+        }
     </script>
 </body>
-</html>"""
-    
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(html_content)
-    
-    print(f"Generated: {safe_filename}")
+</html>""", ad=AD_BLOCK, css=ARTICLE_CSS_NAME)
+
+# Static output. Shared assets are written to BLOG_DIR/ASSET_DIR under
+# content-hashed names, so that directory can be served with
+# "Cache-Control: immutable"; build_page() points the pages at them and
+# minifies them. Every text file write_if_changed() writes gets .gz (and,
+# with the brotli package, .br) siblings for servers that send precompressed
+# files (nginx gzip_static/brotli_static and the like).
+ASSET_DIR = "assets"
+SITE_ASSETS = ("style.css", "favicon.png")  # the calculator's own files, one level above BLOG_DIR
+PRECOMPRESS = (".html", ".css", ".js", ".json")
+COMPRESSED_SUFFIXES = (".gz", ".br")  # every sibling get_compressors() can write
+BROTLI_QUALITY = 9           # 11 saves another ~10% but is ~4x slower, and a template change rewrites every page
+_asset_urls = {}             # board output -> {reference in the templates: fingerprinted path}
+_compressors = None
+
+def fingerprint(name, data):
+    stem, ext = os.path.splitext(name)
+    return f"{stem}.{hashlib.sha256(data).hexdigest()[:10]}{ext}"
+
+def shared_assets():
+    """(reference in the templates, fingerprinted path, bytes) of the current board's shared assets."""
+    assets = [(ARTICLE_CSS_NAME, ARTICLE_CSS.encode('utf-8')), (SEARCH_JS_NAME, SEARCH_JS.encode('utf-8'))]
+    for name in SITE_ASSETS:
+        try:
+            with open(blog_path("..", name), 'rb') as f:
+                assets.append(("../" + name, f.read()))
+        except FileNotFoundError:
+            pass  # not next to this board: the page keeps the plain link
+    return [(ref, f"{ASSET_DIR}/{fingerprint(os.path.basename(ref), data)}", data) for ref, data in assets]
+
+def asset_urls():
+    board = current_board()
+    if board.output not in _asset_urls:
+        _asset_urls[board.output] = {ref: path for ref, path, _ in shared_assets()}
+    return _asset_urls[board.output]
+
+_comment_re = re.compile(r'<!--(?!\[if).*?-->', re.S)
+_raw_text_re = re.compile(r'<(pre|textarea|script|style)\b.*?</\1\s*>', re.S | re.I)
+_HTML_SPACE = " \t\r\f"
+
+def _collapse_lines(text):
+    if "<!--" in text:
+        text = _comment_re.sub("", text)
+    lines = text.split("\n")
+    if len(lines) == 1:
+        return text
+    # Whitespace around a line break (and blank lines) becomes one newline;
+    # str methods rather than a regex, which is ~5x slower on long articles
+    first, *middle, last = lines
+    middle = [line for line in (line.strip(_HTML_SPACE) for line in middle) if line]
+    return "\n".join([first.rstrip(_HTML_SPACE), *middle, last.lstrip(_HTML_SPACE)])
+
+def minify_html(html):
+    """
+    Drops comments and reduces every run of whitespace that contains a line
+    break to one newline, outside pre/textarea/script/style. Whitespace within
+    a line is left alone, so the page renders exactly as before.
+    """
+    out, pos = [], 0
+    for m in _raw_text_re.finditer(html):
+        out.append(_collapse_lines(html[pos:m.start()]))
+        out.append(m.group())
+        pos = m.end()
+    out.append(_collapse_lines(html[pos:]))
+    return "".join(out).strip()
+
+def build_page(html):
+    """Post-render step for every page: links to fingerprinted assets, then minify_html()."""
+    for ref, path in asset_urls().items():
+        html = html.replace(f'="{ref}"', f'="{path}"')
+    return minify_html(html)
+
+def get_compressors():
+    """[(suffix, compress)] for precompressed siblings; .br only if brotli is installed."""
+    global _compressors
+    if _compressors is None:
+        import gzip
+        _compressors = [(".gz", lambda data: gzip.compress(data, 9, mtime=0))]
+        try:
+            import brotli
+            _compressors.append((".br", lambda data: brotli.compress(data, quality=BROTLI_QUALITY)))
+        except ImportError:
+            print("brotli is not installed: writing .gz files only")
+    return _compressors
+
+def precompress(path, data, missing_only=False):
+    if not path.endswith(PRECOMPRESS) or os.path.basename(path).startswith("."):
+        return  # dotfiles are crawler state, not served
+    compressors = get_compressors()
+    for suffix, compress in compressors:
+        if not (missing_only and os.path.exists(path + suffix)):
+            _atomic_write(path + suffix, compress(data))
+    if not missing_only:
+        # A sibling we can no longer write (brotli uninstalled) would be served stale
+        available = {suffix for suffix, _ in compressors}
+        for suffix in COMPRESSED_SUFFIXES:
+            if suffix not in available and os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+def remove_output(path):
+    """Deletes a generated file together with its precompressed siblings."""
+    for suffix in ("",) + COMPRESSED_SUFFIXES:
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+def write_if_changed(path, data):
+    """
+    Atomically writes `data` (and its precompressed siblings) unless the file
+    already holds exactly these bytes. Returns True if written.
+    """
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    try:
+        if os.path.getsize(path) == len(data):
+            with open(path, 'rb') as f:
+                if hashlib.sha256(f.read()).digest() == hashlib.sha256(data).digest():
+                    precompress(path, data, missing_only=True)
+                    return False
+    except FileNotFoundError:
+        pass
+    _atomic_write(path, data)
+    precompress(path, data)
+    return True
+
+def write_assets():
+    """Writes the shared assets the blog pages link to under their fingerprinted names."""
+    assets = shared_assets()
+    os.makedirs(blog_path(ASSET_DIR), exist_ok=True)
+    for _, path, data in assets:
+        if write_if_changed(blog_path(path), data):
+            print(f"Updated {path}")
+    _asset_urls[current_board().output] = {ref: path for ref, path, _ in assets}
+
+def generate_html(article):
+    write_assets()
+    safe_filename, html_content = render_article(article)
+    write_article(safe_filename, html_content)
     return safe_filename
 
-def update_index(html_files_map):
-    # html_files_map is list of (filename, title, date, content_preview)
-    index_path = os.path.join(BLOG_DIR, "index.html")
+def write_article(safe_filename, html_content):
+    """Write stage: returns False if the file on disk was already identical."""
+    if write_if_changed(blog_path(safe_filename), html_content):
+        print(f"Generated: {safe_filename}")
+        return True
+    print(f"Unchanged: {safe_filename}")
+    return False
+
+def render_article(article):
+    """Render stage: returns (filename, html) without touching the disk."""
+    title = display_title(article['title'])
+    safe_filename = sanitize_filename(title) + ".html"
     
-    new_items = ""
-    for item in html_files_map:
-        filename, title, date, preview = item
-        new_items += f"""
-        <a href="{filename}" class="article-card">
-            <h2 class="article-title">{title}</h2>
-            <div class="article-meta">{date} · 보도자료</div>
-            <p class="article-excerpt">{preview}</p>
-        </a>
-        """
+    # File Block HTML
+    file_html = ""
+    if article['files']:
+        items = "".join(
+            f'<li><a href="{f["local"]}" download="{f["name"]}">📄 {f["name"]}</a></li>' if f.get("local") else
+            f'<li><a href="{f["url"]}" target="_blank">📄 {f["name"]}</a></li>'
+            for f in article['files'])
+        file_html = f'<div class="file-download-box"><h4>첨부파일</h4><ul>{items}</ul></div>'
+
+    html_content = render_article_page(title=title, date=article['date'], content=article['content'],
+                                       files=file_html, url=article['url'], label=current_board().label)
+    return safe_filename, build_page(html_content)
+
+# Search index. BLOG_DIR/search holds SEARCH_SHARDS shard files mapping tokens to
+# sorted doc numbers, and docs-<k>.json files with [file, title, date] of doc
+# numbers k * SEARCH_DOCS_PER_SHARD and up. Tokens are character bigrams (works
+# for Korean without a morphological analyser) and live in shard ord(first char)
+# % SEARCH_SHARDS, so a query only fetches the token shards it needs and then
+# the docs files of its hits. The index is updated per article; SEARCH_STATE_NAME
+# remembers which shards each article touched so it can be replaced without a
+# full rebuild.
+SEARCH_DIR = "search"
+SEARCH_SHARDS = 64
+SEARCH_DOCS_PER_SHARD = 256
+SEARCH_STATE_NAME = ".search-state.json"
+SEARCH_JS_NAME = "search.js"
+
+_search_word_re = re.compile(r'[^\W_]+')
+
+def search_tokens(text):
+    """Character bigrams of every word (single-character words are kept as is)."""
+    tokens = set()
+    for word in _search_word_re.findall(unicodedata.normalize("NFKC", text).lower()):
+        if len(word) == 1:
+            tokens.add(word)
+        else:
+            tokens.update(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+def search_shard(token):
+    return ord(token[0]) % SEARCH_SHARDS
+
+def _load_json(path, default):
+    if not os.path.exists(path):
+        return default
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def _compact_json(data):
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+
+def update_search_index(docs, keep=None):
+    """
+    (Re)indexes `docs` (dicts with id, file, title, date, text): their old
+    postings are dropped and the new ones added. With `keep` (a set of IDs),
+    documents not in it are removed too. Only touched shards are rewritten.
+    """
+    search_dir = blog_path(SEARCH_DIR)
+    os.makedirs(search_dir, exist_ok=True)
+    os.makedirs(state_path(), exist_ok=True)
+    search_state_path = state_path(SEARCH_STATE_NAME)
+    state = _load_json(search_state_path, {"next": 0, "docs": {}})
+    shards = {}
+    def shard(n):
+        if n not in shards:
+            shards[n] = _load_json(os.path.join(search_dir, f"{n}.json"), {})
+        return shards[n]
+    doc_shards = {}
+    def doc_shard(number):
+        k = number // SEARCH_DOCS_PER_SHARD
+        if k not in doc_shards:
+            doc_shards[k] = _load_json(os.path.join(search_dir, f"docs-{k}.json"), {})
+        return doc_shards[k]
+    # Indexes built before the docs were sharded kept them all in one docs.json
+    legacy_docs = os.path.join(search_dir, "docs.json")
+    for number, doc in _load_json(legacy_docs, {}).items():
+        doc_shard(int(number))[number] = doc
+
+    docs = list(docs)
+    stale = {doc["id"] for doc in docs}
+    if keep is not None:
+        stale.update(aid for aid in state["docs"] if aid not in keep)
+    # Drop old postings, one pass per affected shard
+    removed = {}
+    old_numbers = {}
+    for aid in stale:
+        old = state["docs"].pop(aid, None)
+        if old:
+            old_numbers[aid] = old["n"]
+            doc_shard(old["n"]).pop(str(old["n"]), None)
+            for n in old["shards"]:
+                removed.setdefault(n, set()).add(old["n"])
+    for n, numbers in removed.items():
+        postings = shard(n)
+        for token in list(postings):
+            postings[token] = [d for d in postings[token] if d not in numbers]
+            if not postings[token]:
+                del postings[token]
 
-    header = """<!DOCTYPE html>
+    # Re-indexed docs keep their number, so a rebuild of unchanged articles
+    # rewrites nothing; new ones get the next number and are simply appended
+    for doc in docs:
+        number = old_numbers.get(doc["id"])
+        if number is None:
+            number = state["next"]
+            state["next"] += 1
+        touched = set()
+        for token in search_tokens(doc["title"] + "\n" + doc["text"]):
+            n = search_shard(token)
+            numbers = shard(n).setdefault(token, [])
+            if not numbers or numbers[-1] < number:
+                numbers.append(number)
+            else:
+                bisect.insort(numbers, number)
+            touched.add(n)
+        state["docs"][doc["id"]] = {"n": number, "shards": sorted(touched)}
+        doc_shard(number)[str(number)] = [doc["file"], doc["title"], doc["date"]]
+
+    for n, postings in shards.items():
+        write_if_changed(os.path.join(search_dir, f"{n}.json"), _compact_json(postings))
+    for k, entries in doc_shards.items():
+        write_if_changed(os.path.join(search_dir, f"docs-{k}.json"), _compact_json(entries))
+    remove_output(legacy_docs)
+    write_if_changed(search_state_path, json.dumps(state, separators=(',', ':')))
+    if docs or removed:
+        print(f"Search index: {len(docs)} indexed, {len(stale) - len(docs)} removed, {len(shards)} shards touched")
+
+def search_text(content_html):
+    return re.sub(r'<[^>]+>', ' ', content_html)
+
+def seed_search_index(db, manifest):
+    """
+    Indexes the stored articles once, for blogs built before the search index
+    existed. Articles without stored text are read from their generated page.
+    """
+    if os.path.exists(state_path(SEARCH_STATE_NAME)) or not manifest["articles"]:
+        return
+    texts = dict(db.execute("SELECT id, text FROM articles WHERE text IS NOT NULL"))
+    docs = []
+    for aid, entry in manifest["articles"].items():
+        text = texts.get(aid)
+        path = blog_path(entry["file"])
+        if text is None and os.path.exists(path):
+            from bs4 import BeautifulSoup
+            with open(path, encoding='utf-8') as f:
+                body = BeautifulSoup(f.read(), 'html.parser').select_one("div.article-body")
+            text = body.get_text(" ") if body else None
+        if text is not None:
+            docs.append({"id": aid, "file": entry["file"], "title": entry["title"],
+                         "date": entry["date"], "text": text})
+    update_search_index(docs)
+
+SEARCH_JS = """(function () {
+    var SHARDS = %d, DOCS_PER_SHARD = %d;
+    var box = document.getElementById('search-box');
+    var results = document.getElementById('search-results');
+    var list = document.getElementById('post-list');
+    if (!box || !results || !list) return;
+    var shards = {}, docShards = {}, timer = null;
+
+    // Same tokens as search_tokens() in scripts/crawling_to_blog.py
+    function tokens(text) {
+        var out = {};
+        (text.normalize('NFKC').toLowerCase().match(/[\\p{L}\\p{N}]+/gu) || []).forEach(function (word) {
+            var chars = Array.from(word);
+            if (chars.length === 1) out[chars[0]] = true;
+            for (var i = 0; i < chars.length - 1; i++) out[chars[i] + chars[i + 1]] = true;
+        });
+        return Object.keys(out);
+    }
+    function load(path) {
+        return fetch(path).then(function (r) { return r.ok ? r.json() : {}; });
+    }
+    function shard(n) {
+        if (!(n in shards)) shards[n] = load('search/' + n + '.json');
+        return shards[n];
+    }
+    function docShard(k) {
+        if (!(k in docShards)) docShards[k] = load('search/docs-' + k + '.json');
+        return docShards[k];
+    }
+    function search(query) {
+        var terms = tokens(query);
+        if (!terms.length) return Promise.resolve([]);
+        var needed = {};
+        terms.forEach(function (t) { needed[t.codePointAt(0) %% SHARDS] = true; });
+        return Promise.all(Object.keys(needed).map(shard)).then(function (loaded) {
+            var postings = Object.assign.apply(null, [{}].concat(loaded));
+            var hits = {};
+            terms.forEach(function (t) {
+                (postings[t] || []).forEach(function (n) { hits[n] = (hits[n] || 0) + 1; });
+            });
+            var numbers = Object.keys(hits).filter(function (n) { return hits[n] === terms.length; });
+            // Only the docs files that hold a hit
+            var files = {};
+            numbers.forEach(function (n) { files[Math.floor(n / DOCS_PER_SHARD)] = true; });
+            return Promise.all(Object.keys(files).map(docShard)).then(function (loadedDocs) {
+                var allDocs = Object.assign.apply(null, [{}].concat(loadedDocs));
+                var q = query.normalize('NFKC').toLowerCase().trim();
+                return numbers.filter(function (n) { return allDocs[n]; })
+                    .map(function (n) { return allDocs[n]; })
+                    .sort(function (a, b) {
+                        var ta = a[1].toLowerCase().indexOf(q) >= 0, tb = b[1].toLowerCase().indexOf(q) >= 0;
+                        return ta !== tb ? (tb ? 1 : -1) : b[2].localeCompare(a[2]);
+                    });
+            });
+        });
+    }
+    function show(query, found) {
+        results.innerHTML = '';
+        found.slice(0, 50).forEach(function (doc) {
+            var a = document.createElement('a');
+            a.href = doc[0];
+            a.className = 'article-card';
+            a.innerHTML = '<h2 class="article-title"></h2><div class="article-meta"></div>';
+            a.children[0].textContent = doc[1];
+            a.children[1].textContent = doc[2] + ' · ' + (list.dataset.label || '');
+            results.appendChild(a);
+        });
+        if (!found.length) {
+            var empty = document.createElement('p');
+            empty.className = 'search-empty';
+            empty.textContent = '"' + query + '"에 대한 검색 결과가 없습니다.';
+            results.appendChild(empty);
+        }
+    }
+    function toggle(searching) {
+        results.hidden = !searching;
+        list.hidden = searching;
+        var pagination = document.querySelector('.pagination');
+        if (pagination) pagination.hidden = searching || !!list.dataset.loaded;
+    }
+    box.addEventListener('input', function () {
+        clearTimeout(timer);
+        timer = setTimeout(function () {
+            var query = box.value.trim();
+            if (!query) return toggle(false);
+            search(query).then(function (found) {
+                if (box.value.trim() !== query) return;  // a newer query is on its way
+                show(query, found);
+                toggle(true);
+            });
+        }, 150);
+    });
+})();
+""" % (SEARCH_SHARDS, SEARCH_DOCS_PER_SHARD)
+
+# Blog index: INDEX_PAGE_SIZE cards per page (index.html, page-2.html, ...) plus
+# a compact JSON listing of every post, which is also the merge base for updates.
+INDEX_PAGE_SIZE = 20
+INDEX_LISTING_NAME = "index.json"
+
+PINNED_CARDS = """
+        <!-- Article 1 -->
+        <a href="article-1.html" class="article-card">
+            <h2 class="article-title">농지연금, 실제 조회는 어떻게 하나요?</h2>
+            <div class="article-meta">2026.01.17 · 가이드</div>
+            <p class="article-excerpt">
+                공시지가와 감정평가액 중 무엇이 유리할까요? 배우자 승계형 가입 시 주의할 점은 무엇일까요?
+                농지은행 공식 기준을 바탕으로 핵심만 정리해 드립니다.
+            </p>
+        </a>"""
+
+render_index_page = compile_template("""<!DOCTYPE html>
 <html lang="ko">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport"
         content="width=device-width, initial-scale=1.0, maximum-scale=1.0, user-scalable=no, viewport-fit=cover">
     <meta name="description" content="농지연금 가입 전 꼭 알아야 할 필수 정보와 꿀팁을 확인하세요.">
-    <title>농지연금 가이드 | 블로그</title>
+    <title>농지연금 가이드 | 블로그{{title_suffix}}</title>
     
     <link rel="icon" type="image/png" href="../favicon.png">
     <link rel="apple-touch-icon" href="../favicon.png">
@@ -411,6 +1686,12 @@ def update_index(html_files_map):
         .article-excerpt { font-size: 1rem; line-height: 1.6; color: var(--color-text-main); }
         .back-nav { padding: 20px; max-width: 720px; margin: 0 auto; }
         .btn-back { background: none; border: none; color: var(--color-primary); font-weight: 600; cursor: pointer; font-size: 1rem; display: flex; align-items: center; gap: 8px; }
+        .pagination { display: flex; flex-wrap: wrap; justify-content: center; gap: 8px; margin: 32px 0; }
+        .pagination a, .pagination span { min-width: 40px; padding: 8px 12px; border-radius: 8px; border: 1px solid var(--color-border); text-align: center; text-decoration: none; color: var(--color-text-sub); font-weight: 600; }
+        .pagination .current { background: var(--color-primary); border-color: var(--color-primary); color: white; }
+        .search-box { display: block; width: 100%; max-width: 480px; margin: 24px auto 0; padding: 14px 18px; border-radius: 12px; border: 1px solid var(--color-border); background: var(--color-bg); color: var(--color-text-main); font-size: 1rem; }
+        .search-empty { text-align: center; color: var(--color-text-sub); padding: 40px 0; }
+        .btn-more { display: block; width: 100%; padding: 16px; margin: 8px 0 24px; border-radius: 12px; border: 1px solid var(--color-border); background: var(--color-surface); color: var(--color-primary); font-weight: 700; font-size: 1rem; cursor: pointer; }
     </style>
 </head>
 
@@ -427,88 +1708,274 @@ def update_index(html_files_map):
     <header class="blog-header">
         <h1 class="app-title" style="font-size: 2rem;">농지연금 인사이트</h1>
         <p class="section-desc" style="margin-bottom:0;">현명한 노후 설계를 위한 필수 가이드</p>
+        <input type="search" id="search-box" class="search-box" placeholder="{{label}} 검색 (예: 청년 농업인)" aria-label="블로그 검색">
     </header>
 
-    <main class="blog-container">
-"""
-    
-    footer = """
-        <!-- Article 1 -->
-        <a href="article-1.html" class="article-card">
-            <h2 class="article-title">농지연금, 실제 조회는 어떻게 하나요?</h2>
-            <div class="article-meta">2026.01.17 · 가이드</div>
-            <p class="article-excerpt">
-                공시지가와 감정평가액 중 무엇이 유리할까요? 배우자 승계형 가입 시 주의할 점은 무엇일까요?
-                농지은행 공식 기준을 바탕으로 핵심만 정리해 드립니다.
-            </p>
-        </a>
+    <div class="blog-container" id="search-results" hidden></div>
+    <main class="blog-container" id="post-list" data-listing="{{listing}}" data-shown="{{shown}}" data-label="{{label}}">
+{{cards}}{{extra}}
     </main>
-
+{{pagination}}
     <script>
         if (localStorage.getItem('theme') === 'dark') {
             document.body.classList.add('dark-mode');
         }
     </script>
+    <script src="{{search_js}}" defer></script>
 </body>
 </html>
+""", listing=INDEX_LISTING_NAME, search_js=SEARCH_JS_NAME)
+
+# Front page only: "더 보기" appends older cards from the JSON listing instead of paging
+LOAD_MORE = """
+        <button type="button" class="btn-more" id="load-more" hidden>이전 글 더 보기</button>
+        <script>
+        (function () {
+            var list = document.getElementById('post-list');
+            var button = document.getElementById('load-more');
+            var shown = parseInt(list.dataset.shown, 10), posts = null;
+            function card(post) {
+                var a = document.createElement('a');
+                a.href = post[1];
+                a.className = 'article-card';
+                a.innerHTML = '<h2 class="article-title"></h2><div class="article-meta"></div><p class="article-excerpt"></p>';
+                a.children[0].textContent = post[2];
+                a.children[1].textContent = post[3] + ' · ' + list.dataset.label;
+                a.children[2].textContent = post[4];
+                return a;
+            }
+            function more() {
+                posts.slice(shown, shown + %d).forEach(function (post) { list.insertBefore(card(post), button); });
+                shown = Math.min(shown + %d, posts.length);
+                button.hidden = shown >= posts.length;
+            }
+            fetch(list.dataset.listing).then(function (r) { return r.json(); }).then(function (listing) {
+                posts = listing.posts;
+                button.hidden = shown >= posts.length;
+                var pagination = document.querySelector('.pagination');
+                if (pagination) pagination.hidden = true;
+            });
+            button.addEventListener('click', more);
+        })();
+        </script>""" % (INDEX_PAGE_SIZE, INDEX_PAGE_SIZE)
+
+def index_page_name(page):
+    return "index.html" if page == 1 else f"page-{page}.html"
+
+def render_index_card(post, label):
+    _, filename, title, date, preview = post
+    return f"""
+        <a href="{filename}" class="article-card">
+            <h2 class="article-title">{title}</h2>
+            <div class="article-meta">{date} · {label}</div>
+            <p class="article-excerpt">{preview}</p>
+        </a>
+        """
+
+def render_pagination(page, page_count):
+    if page_count <= 1:
+        return ""
+    links = []
+    if page > 1:
+        links.append(f'<a href="{index_page_name(page - 1)}">←</a>')
+    for p in range(1, page_count + 1):
+        if p == page:
+            links.append(f'<span class="current">{p}</span>')
+        else:
+            links.append(f'<a href="{index_page_name(p)}">{p}</a>')
+    if page < page_count:
+        links.append(f'<a href="{index_page_name(page + 1)}">→</a>')
+    return '    <nav class="pagination">' + "".join(links) + "</nav>\n"
+
+def load_index_listing():
+    path = blog_path(INDEX_LISTING_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)["posts"]
+
+def update_index(entries, replace=False, force=False):
+    """
+    Merges `entries` (dicts with id, file, title, date, preview) into the
+    listing by article ID, sorts newest first and re-renders only the index
+    pages whose cards or page count changed (every page with `force`, e.g.
+    after a template change). With `replace`, `entries` is the complete
+    listing rather than an update.
+    """
+    old_posts = load_index_listing() or []
+    posts = {} if replace else {post[0]: post for post in old_posts}
+    for e in entries:
+        posts[e["id"]] = [e["id"], e["file"], e["title"], e["date"], e["preview"]]
+    posts = sorted(posts.values(), key=lambda post: (post[3], post[0]), reverse=True)
+
+    board = current_board()
+    page_count = max(1, -(-len(posts) // INDEX_PAGE_SIZE))
+    old_page_count = max(1, -(-len(old_posts) // INDEX_PAGE_SIZE))
+    for page in range(1, page_count + 1):
+        chunk = posts[(page - 1) * INDEX_PAGE_SIZE:page * INDEX_PAGE_SIZE]
+        old_chunk = old_posts[(page - 1) * INDEX_PAGE_SIZE:page * INDEX_PAGE_SIZE]
+        path = blog_path(index_page_name(page))
+        if not force and chunk == old_chunk and page_count == old_page_count and os.path.exists(path):
+            continue
+        html = build_page(render_index_page(
+            title_suffix="" if page == 1 else f" ({page}페이지)",
+            shown=str(len(chunk)),
+            cards="".join(render_index_card(post, board.label) for post in chunk),
+            extra=(PINNED_CARDS if board.pinned else "") + LOAD_MORE if page == 1 else "",
+            pagination=render_pagination(page, page_count),
+            label=board.label,
+        ))
+        if write_if_changed(path, html):
+            print(f"Updated {index_page_name(page)}")
+
+    # Pages past the end (the listing shrank on a full rebuild)
+    page = page_count + 1
+    while os.path.exists(blog_path(index_page_name(page))):
+        remove_output(blog_path(index_page_name(page)))
+        page += 1
+
+    listing = json.dumps({"page_size": INDEX_PAGE_SIZE, "posts": posts}, ensure_ascii=False, separators=(',', ':'))
+    write_if_changed(blog_path(INDEX_LISTING_NAME), listing)
+
+# Gemini. A response counts as finished once a new one exists, no busy marker
+# (the stop button shown while streaming) is left and the DOM has been quiet for
+# RESPONSE_SETTLE seconds. That is watched in the page by a MutationObserver
+# instead of sleeping a fixed time per prompt.
+RESPONSE_SELECTOR = ".model-response-text, markdown-converter"
+INPUT_SELECTOR = "div[contenteditable='true']"
+BUSY_SELECTOR = "button[aria-label*='Stop'], button[aria-label*='중지']"
+RESPONSE_SETTLE = 1.5        # seconds without DOM changes before a response counts as done
+RESPONSE_TIMEOUT = 180       # seconds to wait for one response
+PROMPTS_PER_CHAT = 20        # start a fresh chat after this many prompts (keeps the page small)
+
+WAIT_FOR_RESPONSE_JS = """
+var selector = arguments[0], busy = arguments[1], before = arguments[2], settle = arguments[3];
+var done = arguments[arguments.length - 1];
+var timer = null;
+if (window.__responseObserver) window.__responseObserver.disconnect();
+function latest() {
+    var nodes = document.querySelectorAll(selector);
+    return nodes.length > before ? nodes[nodes.length - 1] : null;
+}
+function check() {
+    clearTimeout(timer);
+    if (!latest()) return;
+    timer = setTimeout(function () {
+        if (busy && document.querySelector(busy)) return;  // still streaming, its removal re-arms us
+        observer.disconnect();
+        done(latest().innerText);
+    }, settle * 1000);
+}
+var observer = window.__responseObserver = new MutationObserver(check);
+observer.observe(document.body, {childList: true, subtree: true, characterData: true, attributes: true});
+check();
+"""
+
+INSERT_TEXT_JS = """
+arguments[0].focus();
+document.execCommand('insertText', false, arguments[1]);
+return arguments[0].innerText;
 """
-    with open(index_path, 'w', encoding='utf-8') as f:
-        f.write(header + new_items + footer)
-    print("Updated index.html")
 
 class GeminiBot:
-    def __init__(self):
+    """
+    One browser session reused for every prompt. Use start()/close() or a
+    `with` block; send_prompt() starts the session on first use. `url` and
+    `chrome_data_dir=None` allow pointing it at a stand-in chat page.
+    """
+    def __init__(self, headless=False, url=GEMINI_URL, chrome_data_dir=CHROME_DATA_DIR):
         self.driver = None
+        self.headless = headless
+        self.url = url
+        self.chrome_data_dir = chrome_data_dir
+        self.prompts_in_chat = 0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def start(self):
+        if self.driver is None:
+            self.setup_driver()
+            self.login_check()
 
     def setup_driver(self):
         """Sets up the Chrome WebDriver with persistent user profile."""
-        if not os.path.exists(CHROME_DATA_DIR):
-            os.makedirs(CHROME_DATA_DIR)
-            print(f"Created chrome data directory at: {CHROME_DATA_DIR}")
-
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+        from selenium.webdriver.chrome.options import Options
+        from webdriver_manager.chrome import ChromeDriverManager
         chrome_options = Options()
-        chrome_options.add_argument(f"user-data-dir={CHROME_DATA_DIR}")
-        chrome_options.add_argument("profile-directory=Default")
-        chrome_options.add_experimental_option("detach", True)
+        if self.chrome_data_dir:
+            if not os.path.exists(self.chrome_data_dir):
+                os.makedirs(self.chrome_data_dir)
+                print(f"Created chrome data directory at: {self.chrome_data_dir}")
+            chrome_options.add_argument(f"user-data-dir={self.chrome_data_dir}")
+            chrome_options.add_argument("profile-directory=Default")
+        if self.headless:
+            chrome_options.add_argument("--headless=new")
+        else:
+            chrome_options.add_experimental_option("detach", True)
         chrome_options.add_argument("--log-level=3")
 
         print("Launching Chrome...")
         self.driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
         self.driver.implicitly_wait(10)
+        self.driver.set_script_timeout(RESPONSE_TIMEOUT)
 
     def login_check(self):
-        self.driver.get(GEMINI_URL)
-        print(f"Navigated to {GEMINI_URL}")
+        self.driver.get(self.url)
+        self.prompts_in_chat = 0
+        print(f"Navigated to {self.url}")
         while "accounts.google.com" in self.driver.current_url:
+            if self.headless:
+                raise RuntimeError("Not logged in to Google; log in once without headless mode.")
             print("\n[!] Please log in to Google in the opened browser window.")
             time.sleep(5)
         print("[+] Login detected! Accessing Gemini...")
 
+    def type_prompt(self, input_box, prompt_text):
+        input_box.click()
+        input_box.clear()
+        typed = self.driver.execute_script(INSERT_TEXT_JS, input_box, prompt_text)
+        if not (typed or "").strip():
+            # Editors that ignore insertText still accept a paste
+            import pyperclip
+            from selenium.webdriver.common.keys import Keys
+            pyperclip.copy(prompt_text)
+            input_box.send_keys(Keys.CONTROL, 'v')
+
     def send_prompt(self, prompt_text):
+        """Sends one prompt and returns the response text, or None on error or timeout."""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.common.keys import Keys
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import TimeoutException
+        self.start()
+        if self.prompts_in_chat >= PROMPTS_PER_CHAT:
+            self.login_check()
         try:
             print("Looking for input box...")
             input_box = WebDriverWait(self.driver, 20).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "div[contenteditable='true']"))
+                EC.element_to_be_clickable((By.CSS_SELECTOR, INPUT_SELECTOR))
             )
-            input_box.click()
-            input_box.clear()
-            pyperclip.copy(prompt_text)
-            input_box.send_keys(Keys.CONTROL, 'v')
-            time.sleep(1)
+            # Not find_elements: on a fresh chat there is nothing to find and the implicit wait would run out
+            before = self.driver.execute_script("return document.querySelectorAll(arguments[0]).length",
+                                                RESPONSE_SELECTOR)
+            self.type_prompt(input_box, prompt_text)
             input_box.send_keys(Keys.ENTER)
-            
-            print("Speaking to Gemini...")
-            time.sleep(3)
-            time.sleep(10) # Simple wait
-            
-            response_elements = self.driver.find_elements(By.CSS_SELECTOR, ".model-response-text") 
-            if not response_elements:
-                response_elements = self.driver.find_elements(By.CSS_SELECTOR, "markdown-converter")
+            self.prompts_in_chat += 1
 
-            if response_elements:
-                return response_elements[-1].text
-            else:
-                return None
+            print("Speaking to Gemini...")
+            return self.driver.execute_async_script(
+                WAIT_FOR_RESPONSE_JS, RESPONSE_SELECTOR, BUSY_SELECTOR, before, RESPONSE_SETTLE)
+        except TimeoutException:
+            print(f"Error: no finished response within {RESPONSE_TIMEOUT}s")
+            return None
         except Exception as e:
             print(f"Error: {e}")
             return None
@@ -516,26 +1983,674 @@ class GeminiBot:
     def close(self):
         if self.driver:
             self.driver.quit()
+            self.driver = None
 
-def main():
-    generated_list = []
-    print("Starting crawler...")
-    
-    target_links = get_article_links()
-    
-    # Process ALL links
-    for i, link in enumerate(target_links): # Removed [:12]
-        print(f"Processing ({i+1}/{len(target_links)}): {link}")
-        data = fetch_article(link)
+# Summaries. Every summary is cached under SUMMARY_CACHE_DIR keyed by
+# sha256(PROMPT_VERSION + adapted content), so an article only reaches Gemini
+# again when its content or the prompt changes (bump PROMPT_VERSION then).
+# Cache misses are sent SUMMARY_BATCH at a time in one prompt.
+SUMMARY_CACHE_DIR = os.path.join(".cache", "summaries")
+SUMMARY_BATCH = 10
+PROMPT_VERSION = 1
+SUMMARY_PROMPT = """다음 보도자료를 블로그 독자를 위해 2문장, 150자 이내의 한국어로 요약해 주세요. 요약문만 답해 주세요.
+
+{text}"""
+SUMMARY_BATCH_PROMPT = """다음 {count}개의 보도자료를 각각 블로그 독자를 위해 2문장, 150자 이내의 한국어로 요약해 주세요.
+답변은 각 요약 앞에 입력과 같은 [[ARTICLE 번호]] 줄을 붙이고, 그 외의 말은 하지 마세요.
+
+{articles}"""
+_batch_marker_re = re.compile(r'\[\[ARTICLE (\d+)\]\]')
+
+def summary_key(content):
+    return hashlib.sha256(f"{PROMPT_VERSION}\n{content}".encode('utf-8')).hexdigest()
+
+def load_summary(key):
+    path = os.path.join(SUMMARY_CACHE_DIR, key + ".txt")
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            return f.read()
+    return None
+
+def store_summary(key, summary):
+    os.makedirs(SUMMARY_CACHE_DIR, exist_ok=True)
+    _atomic_write(os.path.join(SUMMARY_CACHE_DIR, key + ".txt"), summary)
+
+def split_batch_reply(reply, count):
+    """Splits a [[ARTICLE n]]-marked reply into `count` summaries (None where one is missing)."""
+    summaries = [None] * count
+    parts = _batch_marker_re.split(reply or "")
+    for number, text in zip(parts[1::2], parts[2::2]):
+        index = int(number) - 1
+        if 0 <= index < count and text.strip():
+            summaries[index] = text.strip()
+    return summaries
+
+def summarize_contents(contents, bot, batch_size=SUMMARY_BATCH):
+    """
+    Summaries for a list of adapt_blocks() outputs, from the cache where
+    possible. The rest go to `bot` in batches; articles a batch reply leaves
+    out are retried one by one. Failed ones are None.
+    """
+    keys = [summary_key(content) for content in contents]
+    summaries = [load_summary(key) for key in keys]
+    missing = [i for i, summary in enumerate(summaries) if summary is None]
+    metrics.count("summary_cache_hits", len(contents) - len(missing))
+    metrics.count("summary_cache_misses", len(missing))
+    print(f"Summaries: {len(contents) - len(missing)} cached, {len(missing)} to generate")
+    for start in range(0, len(missing), max(batch_size, 1)):
+        batch = missing[start:start + max(batch_size, 1)]
+        texts = [search_text(contents[i]).strip() for i in batch]
+        if len(batch) == 1:
+            replies = [bot.send_prompt(SUMMARY_PROMPT.format(text=texts[0]))]
+        else:
+            articles = "\n\n".join(f"[[ARTICLE {n}]]\n{text}" for n, text in enumerate(texts, 1))
+            reply = bot.send_prompt(SUMMARY_BATCH_PROMPT.format(count=len(batch), articles=articles))
+            replies = split_batch_reply(reply, len(batch))
+            for n, text in enumerate(texts):
+                if replies[n] is None:
+                    replies[n] = bot.send_prompt(SUMMARY_PROMPT.format(text=text))
+        for i, reply in zip(batch, replies):
+            if reply and reply.strip():
+                summaries[i] = reply.strip()
+                store_summary(keys[i], summaries[i])
+    return summaries
+
+def ordered_map(func, items, workers, window):
+    """
+    Like ThreadPoolExecutor.map, but pulls `items` lazily and keeps at most
+    `window` calls in flight, so a long input never piles up in memory.
+    """
+    func = bind_board(profiled(func))
+    if workers <= 1:
+        for item in items:
+            yield func(item)
+        return
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for item in items:
+            pending.append(pool.submit(func, item))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+_DONE = object()
+
+def run_for_board(func, board, parser_backend, arg):
+    """
+    Process-pool entry point: func(arg) with the parent's board and parser.
+    Spawned workers start from the module defaults, so these travel along.
+    """
+    global PARSER_BACKEND
+    PARSER_BACKEND = parser_backend
+    token = _board.set(board)
+    try:
+        return func(arg)
+    finally:
+        _board.reset(token)
+
+def pipeline_stage(func, upstream, maxsize=PIPELINE_BUFFER):
+    """Runs `func` over `upstream` in its own thread, handing results on through a bounded queue."""
+    func = profiled(func)
+    board = _board.get()
+    buffer = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+    def put(item):
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+    def worker():
+        _board.set(board)  # this thread's own context
+        try:
+            for item in upstream:
+                if not put((func(item), None)):
+                    return
+        except BaseException as e:
+            put((None, e))
+        put((_DONE, None))
+    threading.Thread(target=worker, daemon=True).start()
+    try:
+        while True:
+            item, error = buffer.get()
+            if error is not None:
+                raise error
+            if item is _DONE:
+                return
+            yield item
+    finally:
+        stop.set()  # consumer gave up: let the worker thread exit
+
+_KNOWN = object()  # crawl(): already in the manifest, not re-fetched
+
+def crawl(db, manifest, links, workers=MAX_WORKERS, full=False, revalidate=False,
+          checkpoint_every=CHECKPOINT_EVERY, mirror=False, summary_batch=None, processes=1,
+          scan_state=None):
+    """
+    Streams `links` through fetch -> parse -> render -> write -> store (`db`,
+    see open_store). Every stage hands
+    items on through a bounded buffer, so memory stays flat however large the
+    board is, and the manifest and index are checkpointed every
+    `checkpoint_every` articles so an interrupted run can pick up where it left off.
+    Known articles are only re-fetched (conditionally) with `revalidate`.
+    With `full`, articles no longer listed are dropped from the store, the
+    index and the blog, but only if `scan_state` (see iter_article_links)
+    says the whole list was scanned; an article that fails to fetch or parse
+    keeps its previous entry either way, and is retried by the next RETRY_RUNS
+    runs (manifest["retry"]). The list validators in `scan_state` are only
+    kept when nothing failed, so a 304 never hides a post that is missing.
+    With `mirror`, attachments are downloaded between parse and render so the
+    pages link to local copies. With `summary_batch`, written articles get a
+    Gemini summary (see summarize_contents) as their index excerpt. With
+    `processes` > 1, parsing and rendering (pure CPU) run in a process pool
+    while fetching stays on threads in this process; output is identical.
+    Returns the number of articles (re)written.
+    """
+    known = {} if full else manifest["articles"]
+    previous = dict(manifest["articles"])
+    owners = {entry["file"]: aid for aid, entry in previous.items() if "file" in entry}
+    stored = {aid for (aid,) in db.execute("SELECT id FROM articles WHERE content IS NOT NULL")}
+    seen = {}
+    pending = {}  # written since the last index update
+    pending_search = {}  # ... and their text, for the search index
+    attachments = manifest.setdefault("attachments", {})  # attachment URL -> mirrored path
+    retry = manifest.setdefault("retry", {})  # article ID -> {"link", "runs"} of failed articles
+    failed = 0  # articles that failed and will be retried
+    pending_summary = {}  # ... and their content, to summarize
+    bot = GeminiBot() if summary_batch else None  # the browser only starts on a cache miss
+    pool = None
+    if processes > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        pool = ProcessPoolExecutor(processes)
+
+    def offload(func, arg):
+        if pool is None:
+            return func(arg)
+        return pool.submit(run_for_board, func, current_board(), PARSER_BACKEND, arg).result()
+
+    def fetch(link):
+        aid = article_id(link)
+        entry = known.get(aid)
+        if entry and not revalidate:
+            return link, aid, entry, _KNOWN
+        with metrics.timer("fetch"):
+            return link, aid, entry, download_article(link, entry)
+
+    def parse(item):
+        link, aid, entry, page = item
+        if page is None or page is NOT_MODIFIED or page is _KNOWN:
+            return link, aid, entry, page
+        with metrics.timer("parse"):
+            data = offload(parse_article, page)
         if data:
-            fname = generate_html(data)
-            display_title = data['title'].replace('[보도자료]', '').strip()
-            preview = re.sub(r'<[^>]+>', '', data['content'])[:60] + "..."
-            generated_list.append((fname, display_title, data['date'], preview))
-    
-    if generated_list:
-        update_index(generated_list)
-        print("Success! Generated blog posts.")
+            data["raw_html"] = page["html"]  # kept in the store
+        return link, aid, entry, data
+
+    def mirror_stage(item):
+        link, aid, entry, data = item
+        if isinstance(data, dict) and data["files"]:
+            with metrics.timer("mirror"):
+                data = dict(data, files=mirror_attachments(data["files"], attachments))
+        return link, aid, entry, data
+
+    def render(item):
+        link, aid, entry, data = item
+        if data is None or data is NOT_MODIFIED or data is _KNOWN:
+            return item, None
+        digest = content_hash(data)
+        if entry and entry.get("hash") == digest and os.path.exists(blog_path(entry["file"])):
+            return item, None
+        with metrics.timer("render"):
+            return item, offload(render_article, data)
+
+    def summarize_pending():
+        nonlocal bot
+        items = list(pending_summary.items())
+        pending_summary.clear()
+        if not (bot and items):
+            return
+        try:
+            with metrics.timer("summarize"):
+                summaries = summarize_contents([content for _, content in items], bot, summary_batch)
+        except Exception as e:
+            print(f"Summaries disabled for this run: {e}")
+            bot.close()
+            bot = None
+            return
+        for (aid, _), summary in zip(items, summaries):
+            if summary:
+                seen[aid]["preview"] = escape(summary)
+
+    def checkpoint(final=False):
+        summarize_pending()
+        # Only a complete scan can tell that an article is gone from the board
+        prune = final and full and bool(scan_state and scan_state.get("complete"))
+        # Articles seen this run come first (list order), older ones keep their order
+        articles = dict(seen)
+        if not prune:
+            for aid, entry in previous.items():
+                articles.setdefault(aid, entry)
+        manifest["articles"] = articles
+        with metrics.timer("manifest"):
+            save_manifest(db, manifest)
+        if prune:
+            kept_files = {entry.get("file") for entry in articles.values()}
+            for aid, entry in previous.items():
+                if aid not in articles and entry.get("file") and entry["file"] not in kept_files:
+                    print(f"Removed: {entry['file']}")
+                    remove_output(blog_path(entry["file"]))
+        # The index merges updates by ID; it only needs everything to drop posts or to bootstrap
+        with metrics.timer("index"):
+            rebuild = prune or load_index_listing() is None
+            rows = articles.items() if rebuild else pending.items()
+            if rows:
+                update_index([{"id": aid, **entry} for aid, entry in rows], replace=rebuild)
+        if pending_search or prune:
+            with metrics.timer("search"):
+                update_search_index(pending_search.values(), keep=set(articles) if prune else None)
+        pending.clear()
+        pending_search.clear()
+
+    write_assets()
+    if not full:
+        seed_search_index(db, manifest)
+    fetched = ordered_map(fetch, links, workers, PIPELINE_BUFFER)
+    # With a pool, several stage threads each wait on one worker process
+    if pool:
+        parsed = ordered_map(parse, fetched, processes, PIPELINE_BUFFER)
+    else:
+        parsed = pipeline_stage(parse, fetched)
+    if mirror:
+        parsed = ordered_map(mirror_stage, parsed, ATTACHMENT_WORKERS, PIPELINE_BUFFER)
+    if pool:
+        rendered = ordered_map(render, parsed, processes, PIPELINE_BUFFER)
+    else:
+        rendered = pipeline_stage(render, parsed)
+
+    changed = 0
+    since_checkpoint = 0
+    for i, ((link, aid, entry, data), output) in enumerate(rendered):
+        if data:
+            retry.pop(aid, None)
+        if data is _KNOWN:
+            # Keeps the list position of articles an interrupted run already wrote
+            seen[aid] = entry
+            metrics.count("articles_known")
+            continue
+        print(f"Processing ({i+1}): {link}")
+        if data is NOT_MODIFIED:
+            print("  Not modified (304), skipping.")
+            metrics.count("articles_not_modified")
+            if entry:
+                seen[aid] = entry
+            continue
+        if not data:
+            metrics.count("articles_failed")
+            runs = retry.get(aid, {}).get("runs", 0) + 1
+            retry[aid] = {"link": link, "runs": runs}
+            if runs < RETRY_RUNS:
+                failed += 1
+            elif runs == RETRY_RUNS:
+                # Still fetched while it is on a scanned page, but no longer holds up the list
+                print(f"  Giving up on {link} after {runs} runs.")
+            if aid in previous:
+                seen[aid] = previous[aid]  # keep what we had
+            continue
+        if output is None:
+            print("  Content unchanged, skipping.")
+            metrics.count("articles_unchanged")
+            entry.update(article_validators(data))
+            seen[aid] = entry
+            if aid not in stored:
+                store_article(db, aid, entry, data)
+            continue
+        fname, html_content = output
+        fname = unique_filename(fname, aid, owners)
+        attachments.update((f["url"], f["local"]) for f in data["files"] if f.get("local"))
+        with metrics.timer("write"):
+            write_article(fname, html_content)
+        metrics.count("articles_written")
+        title = display_title(data['title'])
+        preview = re.sub(r'<[^>]+>', '', data['content'])[:60] + "..."
+        seen[aid] = {"hash": content_hash(data), "file": fname, "title": title,
+                     "date": data['date'], "preview": preview, **article_validators(data)}
+        pending[aid] = seen[aid]
+        store_article(db, aid, seen[aid], data)
+        if bot:
+            pending_summary[aid] = data['content']
+        pending_search[aid] = {"id": aid, "file": fname, "title": title,
+                               "date": data['date'], "text": search_text(data['content'])}
+        changed += 1
+        since_checkpoint += 1
+        if since_checkpoint >= checkpoint_every:
+            checkpoint()
+            since_checkpoint = 0
+
+    if scan_state and "list" in scan_state and not failed:
+        manifest["list"] = scan_state["list"]
+    if changed or (full and seen):
+        checkpoint(final=True)
+    else:
+        save_manifest(db, manifest)
+    if bot:
+        bot.close()
+    if pool:
+        pool.shutdown()
+    return changed
+
+def crawl_board(args):
+    """Crawls the current board with the options from main(); returns the number of posts written."""
+    with closing(open_store()) as db:
+        manifest = load_manifest(db)
+        scan_state = {}
+        if args.offline:
+            # Cached list pages can be stale relative to each other; ntceMngid order is the board order.
+            # Only articles the store knows are replayed; an empty store (fresh checkout) takes the whole cache
+            target_links = cached_article_links(manifest["articles"] or None)
+            print(f"Replaying {len(target_links)} cached articles.")
+            # The cache is not the board: never a complete scan, so nothing is pruned
+        else:
+            target_links = iter_article_links(manifest, args.full or args.revalidate, scan_state)
+
+        changed = crawl(db, manifest, target_links, args.workers, args.full, args.revalidate,
+                        args.checkpoint_every, args.mirror_attachments,
+                        args.summary_batch if args.summarize else None, args.processes, scan_state)
+        if scan_state.get("complete") and not manifest.get("backfill_complete"):
+            # Every page has been through the pipeline: from now on paging may stop early
+            manifest["backfill_complete"] = True
+            save_manifest(db, manifest)
+    return changed
+
+def rebuild_index(db, manifest):
+    """Re-renders the shared assets and every index page, and seeds the search index if it is missing."""
+    write_assets()
+    with metrics.timer("index"):
+        update_index([{"id": aid, **entry} for aid, entry in manifest["articles"].items()],
+                     replace=True, force=True)
+    with metrics.timer("search"):
+        seed_search_index(db, manifest)
+
+def render_board(args):
+    """
+    `render`: re-renders every page from the store (e.g. after a template
+    change) in `args.processes` worker processes. Nothing is fetched or parsed;
+    returns the number of pages that changed.
+    """
+    pool = None
+    if args.processes > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        pool = ProcessPoolExecutor(args.processes)
+
+    def render(item):
+        aid, fname, article = item
+        with metrics.timer("render"):
+            if pool is None:
+                _, html_content = render_article(article)
+            else:
+                _, html_content = pool.submit(run_for_board, render_article, current_board(),
+                                              PARSER_BACKEND, article).result()
+        return fname, html_content
+
+    with closing(open_store()) as db:
+        manifest = load_manifest(db)
+        changed = 0
+        # Pages are written here, in store order, while the pool renders the next ones
+        for fname, html_content in ordered_map(render, stored_articles(db), args.processes,
+                                               max(args.processes, PIPELINE_BUFFER)):
+            with metrics.timer("write"):
+                changed += write_article(fname, html_content)
+        missing = db.execute("SELECT count(*) FROM articles WHERE content IS NULL").fetchone()[0]
+        if missing:
+            print(f"{missing} articles predate the store and were skipped; `crawl --offline` parses them into it.")
+        if manifest["articles"]:
+            rebuild_index(db, manifest)
+    if pool:
+        pool.shutdown()
+    return changed
+
+def index_board(args):
+    """`index`: re-renders the index pages and shared assets from the store."""
+    with closing(open_store()) as db:
+        manifest = load_manifest(db)
+        if not manifest["articles"]:
+            print(f"No articles in {state_path(STORE_NAME)}; run `crawl` first.")
+            return 0
+        rebuild_index(db, manifest)
+    return len(manifest["articles"])
+
+def summarize_board(args):
+    """
+    `summarize`: Gemini summaries (see summarize_contents) of the stored
+    articles become their index excerpts. Returns the number of summarized articles.
+    """
+    with closing(open_store()) as db:
+        manifest = load_manifest(db)
+        stored = [(aid, article) for aid, _, article in stored_articles(db) if aid in manifest["articles"]]
+        bot = GeminiBot()  # the browser only starts on a cache miss
+        try:
+            with metrics.timer("summarize"):
+                summaries = summarize_contents([article["content"] for _, article in stored], bot, args.summary_batch)
+        finally:
+            bot.close()
+        entries = []
+        for (aid, _), summary in zip(stored, summaries):
+            if summary:
+                manifest["articles"][aid]["preview"] = escape(summary)
+                entries.append({"id": aid, **manifest["articles"][aid]})
+        save_manifest(db, manifest)
+        if entries:
+            with metrics.timer("index"):
+                update_index(entries)
+    return len(entries)
+
+def search_board(args):
+    """`search`: prints the stored articles matching the query (see search_store)."""
+    with closing(open_store()) as db:
+        rows = search_store(db, " ".join(args.query), args.limit)
+    for row in rows:
+        print(f"{row['date']}  {row['title']}\n            {blog_path(row['file'])}")
+    return len(rows)
+
+_stopping = threading.Event()  # set by Ctrl+C during `watch`
+
+def watch_board(args):
+    """
+    `watch`: polls page 1 of the board every `args.interval` seconds with a
+    conditional request and runs only articles the store does not know yet
+    through the pipeline, until Ctrl+C. The first poll of a board that was
+    never fully crawled backfills it. A poll that fails is logged and the
+    next one backs off. Returns the number of posts written.
+    """
+    written = failures = 0
+    with closing(open_store()) as db:
+        manifest = load_manifest(db)
+        print(f"Watching {current_board().list_url} every {args.interval:g}s (Ctrl+C to stop)")
+        while not _stopping.is_set():
+            started = time.monotonic()
+            scan_state = {}
+            try:
+                links = iter_article_links(manifest, scan_state=scan_state)
+                changed = crawl(db, manifest, links, args.workers, checkpoint_every=args.checkpoint_every,
+                                mirror=args.mirror_attachments,
+                                summary_batch=args.summary_batch if args.summarize else None,
+                                processes=args.processes, scan_state=scan_state)
+                if scan_state.get("complete") and not manifest.get("backfill_complete"):
+                    manifest["backfill_complete"] = True
+                    save_manifest(db, manifest)
+            except Exception as e:
+                # A full disk or a locked store should not end the watch; the next poll retries
+                print(f"[{datetime.datetime.now():%H:%M:%S}] Poll failed: {e}")
+                log_event("watch_error", error=f"{e.__class__.__name__}: {e}")
+                scan_state["error"] = e
+                changed = 0
+                db.rollback()
+                manifest = load_manifest(db)  # forget what the failed poll half-applied
+            if changed:
+                print(f"[{datetime.datetime.now():%H:%M:%S}] Published {changed} new posts.")
+            written += changed
+            # Back off while the board is unreachable or polls fail; jitter keeps several boards apart
+            failures = failures + 1 if "error" in scan_state else 0
+            delay = min(args.interval * 2 ** failures, WATCH_MAX_INTERVAL) * random.uniform(0.9, 1.1)
+            _stopping.wait(max(0.0, delay - (time.monotonic() - started)))
+    return written
+
+# Subcommands and how their results are reported
+COMMANDS = {"crawl": "posts generated", "render": "pages re-rendered", "index": "posts indexed",
+            "summarize": "posts summarized", "search": "matches", "watch": "posts published"}
+
+def main(argv=None):
+    global OFFLINE, PARSER_BACKEND, metrics, _profilers
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] not in (*COMMANDS, "-h", "--help"):
+        argv = ["crawl"] + argv  # plain `crawling_to_blog.py --full` still crawls
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--boards", metavar="PATH",
+                        help="run for every board listed in this JSON file concurrently (see load_boards)")
+    common.add_argument("--log-json", metavar="PATH",
+                        help="write every request and the run summary as JSON lines to PATH ('-' = stderr)")
+    common.add_argument("--profile", metavar="PATH",
+                        help="profile the whole run (all threads) and write a pstats dump to PATH")
+    pipeline = argparse.ArgumentParser(add_help=False)
+    pipeline.add_argument("--workers", type=int, default=MAX_WORKERS,
+                          help=f"max concurrent requests; the actual number adapts to the server (default: {MAX_WORKERS}, 1 = serial)")
+    pipeline.add_argument("--checkpoint-every", type=int, default=CHECKPOINT_EVERY,
+                          help=f"save the manifest and index every N articles (default: {CHECKPOINT_EVERY})")
+    pipeline.add_argument("--parser", choices=sorted(PARSER_BACKENDS), default=PARSER_BACKEND,
+                          help=f"HTML parser backend (default: {PARSER_BACKEND})")
+    pipeline.add_argument("--processes", type=int, default=1,
+                          help="parse and render in this many worker processes (default: 1 = in-process)")
+    pipeline.add_argument("--mirror-attachments", action="store_true",
+                          help=f"download attachments into {BLOG_DIR}/{ATTACHMENT_DIR} and link to the local copies "
+                               "(combine with --full to cover existing articles)")
+    summary = argparse.ArgumentParser(add_help=False)
+    summary.add_argument("--summary-batch", type=int, default=SUMMARY_BATCH,
+                         help=f"articles per Gemini prompt (default: {SUMMARY_BATCH})")
+    fetching = argparse.ArgumentParser(add_help=False, parents=[common, pipeline, summary])
+    fetching.add_argument("--rate", type=float, default=REQUESTS_PER_SECOND,
+                          help=f"max requests per second to fbo.or.kr (default: {REQUESTS_PER_SECOND})")
+    fetching.add_argument("--summarize", action="store_true",
+                          help="use Gemini summaries of written articles as index excerpts (cached per content)")
+
+    parser = argparse.ArgumentParser(description="Crawl fbo.or.kr press releases into the blog.",
+                                     epilog="Without a command, `crawl` is assumed.")
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+    crawl_cmd = commands.add_parser("crawl", parents=[fetching],
+                                    help="fetch new or changed articles and update the blog (default)")
+    crawl_cmd.add_argument("--full", action="store_true",
+                           help="ignore the store and re-fetch and regenerate every article")
+    crawl_cmd.add_argument("--revalidate", action="store_true",
+                           help="scan every page and re-check known articles with conditional requests")
+    crawl_cmd.add_argument("--offline", action="store_true",
+                           help=f"re-parse the whole blog from the response cache ({CACHE_DIR}) without network access")
+    crawl_cmd.set_defaults(run=crawl_board)
+    watch_cmd = commands.add_parser("watch", parents=[fetching],
+                                    help="keep polling page 1 and publish new articles as they appear")
+    watch_cmd.add_argument("--interval", type=float, default=WATCH_INTERVAL,
+                           help=f"seconds between polls (default: {WATCH_INTERVAL:g})")
+    watch_cmd.set_defaults(run=watch_board, full=False, revalidate=False, offline=False)
+    render_cmd = commands.add_parser("render", parents=[common],
+                                     help=f"re-render every page from the article store ({STORE_NAME}), "
+                                          "e.g. after a template change")
+    render_cmd.add_argument("--processes", type=int, default=os.cpu_count() or 1,
+                            help="render in this many worker processes (default: every CPU)")
+    render_cmd.set_defaults(run=render_board)
+    index_cmd = commands.add_parser("index", parents=[common],
+                                    help="re-render the index pages and assets from the article store")
+    index_cmd.set_defaults(run=index_board)
+    summarize_cmd = commands.add_parser("summarize", parents=[common, summary],
+                                        help="use Gemini summaries of the stored articles as index excerpts (needs Chrome)")
+    summarize_cmd.set_defaults(run=summarize_board)
+    search_cmd = commands.add_parser("search", parents=[common],
+                                     help="full-text search over the article store")
+    search_cmd.add_argument("query", nargs="+", help="words that must all occur in the title or text")
+    search_cmd.add_argument("--limit", type=int, default=20, help="max results (default: 20)")
+    search_cmd.set_defaults(run=search_board)
+    args = parser.parse_args(argv)
+
+    boards = None
+    if args.boards:
+        try:
+            boards = load_boards(args.boards)
+        except (OSError, ValueError, KeyError) as e:
+            parser.error(f"--boards {args.boards}: {e}")
+    if args.command in ("crawl", "watch"):
+        OFFLINE = args.offline
+        PARSER_BACKEND = args.parser
+        if args.offline:
+            args.full = True
+        else:
+            get_session(pool_size=args.workers)
+        _rate_limiter.interval = 1.0 / args.rate if args.rate > 0 else 0.0
+        _controller.configure(args.workers)
+    metrics = RunMetrics()
+    handler = None
+    if args.log_json:
+        handler = logging.StreamHandler(sys.stderr) if args.log_json == "-" else logging.FileHandler(args.log_json, encoding='utf-8')
+        handler.setFormatter(JsonLogFormatter())
+        log.addHandler(handler)
+        log.setLevel(logging.INFO)
+        log.propagate = False
+    profiler = None
+    if args.profile:
+        _profilers = []
+        profiler = cProfile.Profile()
+        _profile_local.active = True
+        profiler.enable()
+
+    _stopping.clear()
+    previous_sigint = None
+    if args.command == "watch":
+        def stop(signum, frame):
+            if _stopping.is_set():
+                raise KeyboardInterrupt
+            print("\nStopping after the current poll (Ctrl+C again to abort)...")
+            _stopping.set()
+        previous_sigint = signal.signal(signal.SIGINT, stop)
+
+    print(f"Starting {args.command}...")
+    if boards:
+        # One thread per board; they share the session, rate limit and concurrency limit
+        def run(board):
+            _board.set(board)
+            return args.run(args)
+        with ThreadPoolExecutor(max_workers=len(boards)) as pool:
+            results = list(pool.map(run, boards))
+        for board, changed in zip(boards, results):
+            print(f"[{board.name}] {changed} {COMMANDS[args.command]} in {board.output}")
+        changed = sum(results)
+    else:
+        changed = args.run(args)
+    if previous_sigint is not None:
+        signal.signal(signal.SIGINT, previous_sigint)
+
+    if args.command != "crawl":
+        print(f"{changed} {COMMANDS[args.command]}.")
+    elif changed:
+        print(f"Success! Generated {changed} blog posts.")
+    else:
+        print("No new or changed articles.")
+
+    if profiler:
+        profiler.disable()
+        _profile_local.active = False
+        import pstats
+        stats = pstats.Stats(profiler)
+        for thread_profiler in _profilers:
+            stats.add(thread_profiler)
+        stats.dump_stats(args.profile)
+        _profilers = None
+        print(f"\nProfile written to {args.profile} (top functions by cumulative time):")
+        stats.sort_stats("cumulative").print_stats(15)
+    summary = metrics.summary()
+    print_run_summary(summary)
+    log_event("summary", **summary)
+    if handler:
+        log.removeHandler(handler)
+        handler.close()
 
 if __name__ == "__main__":
     main()
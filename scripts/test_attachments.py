@@ -0,0 +1,164 @@
+"""
+Attachment mirroring against a local stand-in for NoticeDownload.do.
+
+    python -m unittest scripts/test_attachments.py    (or: python -m pytest scripts)
+"""
+import hashlib
+import http.server
+import os
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPTS_DIR)
+import crawling_to_blog as crawler
+
+
+class StubFiles(http.server.BaseHTTPRequestHandler):
+    """Serves `files` (path -> bytes) with Range support; paths in `truncate` break off halfway once."""
+    protocol_version = "HTTP/1.1"
+    files = {}
+    truncate = set()
+    requests = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.requests.append((self.path, self.headers.get("Range")))
+        data = self.files.get(self.path)
+        if data is None:
+            return self.send(404, b"")
+        match = re.fullmatch(r"bytes=(\d+)-", self.headers.get("Range") or "")
+        if match:
+            start = int(match.group(1))
+            if start >= len(data):
+                return self.send(416, b"", {"Content-Range": f"bytes */{len(data)}"})
+            return self.send(206, data[start:], {"Content-Range": f"bytes {start}-{len(data) - 1}/{len(data)}"})
+        if self.path in self.truncate:
+            self.truncate.discard(self.path)
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data[:len(data) // 2])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.send(200, data)
+
+    def send(self, status, body, headers=None):
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def blob(seed, size=300_000):
+    return hashlib.sha256(str(seed).encode()).digest() * (size // 32)
+
+
+class AttachmentMirrorTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StubFiles)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.saved = (crawler.BLOG_DIR, crawler.DOWNLOAD_DIR, crawler._rate_limiter, crawler.RETRY_ATTEMPTS)
+        crawler.BLOG_DIR = os.path.join(self.tmp, "blog")
+        crawler.DOWNLOAD_DIR = os.path.join(self.tmp, "downloads")
+        crawler._rate_limiter = crawler.RateLimiter(0)
+        crawler.RETRY_ATTEMPTS = 0
+        StubFiles.files = {}
+        StubFiles.truncate = set()
+        StubFiles.requests = []
+
+    def tearDown(self):
+        crawler.BLOG_DIR, crawler.DOWNLOAD_DIR, crawler._rate_limiter, crawler.RETRY_ATTEMPTS = self.saved
+        shutil.rmtree(self.tmp)
+
+    def serve(self, path, data):
+        StubFiles.files[path] = data
+        return self.base + path
+
+    def partial_path(self, url):
+        return os.path.join(crawler.DOWNLOAD_DIR, hashlib.sha256(url.encode()).hexdigest() + ".partial")
+
+    def assert_mirrored(self, rel_path, data, ext=".pdf"):
+        self.assertEqual(rel_path, f"{crawler.ATTACHMENT_DIR}/{hashlib.sha256(data).hexdigest()}{ext}")
+        with open(crawler.blog_path(rel_path), "rb") as f:
+            self.assertEqual(f.read(), data)
+
+    def test_download(self):
+        data = blob(1)
+        url = self.serve("/NoticeDownload.do?ntceMngid=1&msn=1", data)
+        self.assert_mirrored(crawler.download_attachment(url, "보도자료.PDF"), data)
+        self.assertEqual(os.listdir(crawler.DOWNLOAD_DIR), [])
+
+    def test_resume_after_broken_transfer(self):
+        data = blob(2)
+        url = self.serve("/NoticeDownload.do?ntceMngid=2&msn=1", data)
+        StubFiles.truncate.add("/NoticeDownload.do?ntceMngid=2&msn=1")
+        with self.assertRaises(Exception):
+            crawler.download_attachment(url, "a.pdf")
+        received = os.path.getsize(self.partial_path(url))
+        self.assertTrue(0 < received < len(data))
+        self.assert_mirrored(crawler.download_attachment(url, "a.pdf"), data)
+        self.assertEqual(StubFiles.requests[-1][1], f"bytes={received}-")
+
+    def test_resume_existing_partial(self):
+        data = blob(3)
+        url = self.serve("/NoticeDownload.do?ntceMngid=3&msn=1", data)
+        os.makedirs(crawler.DOWNLOAD_DIR)
+        with open(self.partial_path(url), "wb") as f:
+            f.write(data[:100_000])
+        self.assert_mirrored(crawler.download_attachment(url, "a.pdf"), data)
+        self.assertEqual(StubFiles.requests, [("/NoticeDownload.do?ntceMngid=3&msn=1", "bytes=100000-")])
+
+    def test_stale_partial_restarts_on_416(self):
+        data = blob(4, 64_000)
+        url = self.serve("/NoticeDownload.do?ntceMngid=4&msn=1", data)
+        os.makedirs(crawler.DOWNLOAD_DIR)
+        with open(self.partial_path(url), "wb") as f:
+            f.write(blob(5, 100_000))  # longer than the file is now
+        self.assert_mirrored(crawler.download_attachment(url, "a.pdf"), data)
+        self.assertEqual([r for _, r in StubFiles.requests], ["bytes=100000-", None])
+
+    def test_identical_files_are_stored_once(self):
+        data = blob(6)
+        first = self.serve("/NoticeDownload.do?ntceMngid=6&msn=1", data)
+        second = self.serve("/NoticeDownload.do?ntceMngid=7&msn=1", data)
+        self.assertEqual(crawler.download_attachment(first, "a.pdf"), crawler.download_attachment(second, "b.pdf"))
+        self.assertEqual(len(os.listdir(crawler.blog_path(crawler.ATTACHMENT_DIR))), 1)
+        self.assertEqual(os.listdir(crawler.DOWNLOAD_DIR), [])
+
+    def test_mirror_attachments(self):
+        data = blob(8)
+        files = [{"name": "a.hwp", "url": self.serve("/NoticeDownload.do?ntceMngid=8&msn=1", data)},
+                 {"name": "b.pdf", "url": self.base + "/NoticeDownload.do?ntceMngid=9&msn=1"}]  # 404
+        known = {}
+        mirrored = crawler.mirror_attachments(files, known)
+        self.assert_mirrored(mirrored[0]["local"], data, ".hwp")
+        self.assertNotIn("local", mirrored[1])  # keeps linking to the original
+        # Already mirrored files are not downloaded again
+        known[files[0]["url"]] = mirrored[0]["local"]
+        StubFiles.requests = []
+        self.assertEqual(crawler.mirror_attachments(files[:1], known), mirrored[:1])
+        self.assertEqual(StubFiles.requests, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
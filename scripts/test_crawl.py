@@ -0,0 +1,229 @@
+"""
+Incremental crawling against a local stand-in for the fbo.or.kr board.
+
+    python -m unittest scripts/test_crawl.py    (or: python -m pytest scripts)
+"""
+import contextlib
+import hashlib
+import http.server
+import io
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from urllib.parse import urlsplit, parse_qs
+
+import requests
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPTS_DIR)
+import crawling_to_blog as crawler
+
+LIST_PATH = "/info/bbs/RepdList.do?menuId=080030&schNtceClsfCd=B01010200"
+PER_PAGE = 10
+FIRST_ID = 202500000000
+
+
+def list_path(page):
+    return f"{LIST_PATH}&pageIndex={page}"
+
+
+def article_path(i):
+    return f"/info/bbs/NoticeView.do?menuId=080030&schNtceClsfCd=B01010200&ntceMngid={FIRST_ID + i}"
+
+
+class StubBoard(http.server.BaseHTTPRequestHandler):
+    """
+    A board of `articles` posts (numbered 0..articles-1, newest first) with ETags.
+    Paths in `fail` answer 503 that many times; `requests` logs every path.
+    """
+    protocol_version = "HTTP/1.1"
+    articles = 0
+    fail = {}
+    requests = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.requests.append(self.path)
+        if self.fail.get(self.path):
+            self.fail[self.path] -= 1
+            return self.send(503, b"busy")
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        if url.path.endswith("RepdList.do"):
+            body = self.list_page(int(query["pageIndex"][0]))
+        elif url.path.endswith("NoticeView.do") and 0 <= int(query["ntceMngid"][0]) - FIRST_ID < self.articles:
+            body = self.article_page(int(query["ntceMngid"][0]) - FIRST_ID)
+        else:
+            return self.send(404, b"")
+        body = body.encode("utf-8")
+        etag = '"%s"' % hashlib.md5(body).hexdigest()
+        if self.headers.get("If-None-Match") == etag:
+            return self.send(304, b"", {"ETag": etag})
+        self.send(200, body, {"ETag": etag, "Content-Type": "text/html; charset=utf-8"})
+
+    def list_page(self, page):
+        total = (self.articles + PER_PAGE - 1) // PER_PAGE
+        newest = self.articles - 1 - (page - 1) * PER_PAGE
+        rows = "".join(f'<tr><td class="subject"><a href="{article_path(i).rsplit("/", 1)[1]}">제목 {i}</a></td></tr>'
+                       for i in range(newest, max(-1, newest - PER_PAGE), -1))
+        return (f'<html><body><table>{rows}</table><ul class="m_pagination"><li class="index">'
+                f'<span class="current">{page}</span>/<span class="total">{total}</span></li></ul></body></html>')
+
+    def article_page(self, i):
+        return (f'<html><body><div class="viewTit"><h4>[보도자료] 농지은행 소식 {i}</h4>'
+                f'<ul><li>작성일 2025-{i % 12 + 1:02d}-{i % 28 + 1:02d}</li><li>조회 12</li></ul></div>'
+                f'<div class="viewContent"><p>한국농어촌공사는 {i}번째 소식을 전했다.</p>'
+                f'<p>□ 주요 내용<br>청년 농업인 지원을 {i % 90}% 늘린다.</p></div></body></html>')
+
+    def send(self, status, body, headers=None):
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class CrawlTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StubBoard)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.saved = (crawler.BASE_URL, crawler.LIST_URL, crawler.BLOG_DIR, crawler.CACHE_DIR, crawler.STATE_DIR,
+                      crawler.RETRY_ATTEMPTS, crawler.OFFLINE, crawler.iter_article_links)
+        crawler.BASE_URL = self.base
+        crawler.LIST_URL = self.base + LIST_PATH
+        crawler.BLOG_DIR = os.path.join(self.tmp, "blog")
+        crawler.CACHE_DIR = os.path.join(self.tmp, "cache")
+        crawler.STATE_DIR = os.path.join(self.tmp, "state")
+        crawler.RETRY_ATTEMPTS = 0
+        StubBoard.articles = 25
+        StubBoard.fail = {}
+        StubBoard.requests = []
+
+    def tearDown(self):
+        (crawler.BASE_URL, crawler.LIST_URL, crawler.BLOG_DIR, crawler.CACHE_DIR, crawler.STATE_DIR,
+         crawler.RETRY_ATTEMPTS, crawler.OFFLINE, crawler.iter_article_links) = self.saved
+        shutil.rmtree(self.tmp)
+
+    def run_crawler(self, *argv):
+        StubBoard.requests = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            crawler.main([*argv, "--rate", "0"])
+
+    def manifest(self):
+        with contextlib.closing(crawler.open_store()) as db:
+            return crawler.load_manifest(db)
+
+    def pages(self):
+        """The article pages in the blog, by article number."""
+        files = {entry["file"]: int(aid) - FIRST_ID for aid, entry in self.manifest()["articles"].items()}
+        return {files[name] for name in os.listdir(crawler.BLOG_DIR) if name in files}
+
+    def snapshot(self):
+        contents = {}
+        for root, _, names in os.walk(crawler.BLOG_DIR):
+            for name in names:
+                with open(os.path.join(root, name), "rb") as f:
+                    contents[os.path.relpath(os.path.join(root, name), crawler.BLOG_DIR)] = f.read()
+        return contents
+
+    def test_failed_list_page_is_picked_up_later(self):
+        StubBoard.fail = {list_path(2): 1}
+        self.run_crawler("crawl")
+        self.assertEqual(self.pages(), set(range(5)) | set(range(15, 25)))
+        self.assertFalse(self.manifest().get("backfill_complete"))
+        self.run_crawler("crawl")
+        self.assertEqual(self.pages(), set(range(25)))
+        self.assertTrue(self.manifest().get("backfill_complete"))
+
+    def test_failed_article_is_retried(self):
+        StubBoard.fail = {article_path(3): 1}  # on the last list page
+        self.run_crawler("crawl")
+        self.assertNotIn(3, self.pages())
+        manifest = self.manifest()
+        self.assertFalse(manifest.get("list"))  # page 1 must not answer 304 next time
+        self.assertIn(str(FIRST_ID + 3), manifest["retry"])
+        self.run_crawler("crawl")
+        self.assertIn(3, self.pages())
+        self.assertNotIn(list_path(3), StubBoard.requests)  # the retry list got there, not the scan
+        self.assertFalse(self.manifest()["retry"])
+
+    def test_full_crawl_keeps_articles_it_did_not_see(self):
+        self.run_crawler("crawl")
+        StubBoard.fail = {list_path(3): 1, article_path(12): 1}
+        self.run_crawler("crawl", "--full")
+        self.assertEqual(self.pages(), set(range(25)))
+        StubBoard.fail = {article_path(12): 1}
+        self.run_crawler("crawl", "--full")
+        self.assertEqual(self.pages(), set(range(25)))
+
+    def test_full_crawl_removes_deleted_articles(self):
+        self.run_crawler("crawl")
+        removed = {self.manifest()["articles"][str(FIRST_ID + i)]["file"] for i in (22, 23, 24)}
+        StubBoard.articles = 22
+        self.run_crawler("crawl", "--full")
+        self.assertEqual(self.pages(), set(range(22)))
+        self.assertFalse(removed & set(os.listdir(crawler.BLOG_DIR)))
+
+    def test_offline_replay_neither_prunes_nor_resurrects(self):
+        self.run_crawler("crawl")
+        StubBoard.articles = 22
+        self.run_crawler("crawl", "--full")
+        expected = self.snapshot()
+        # The cache still has the removed articles and misses one that is in the store
+        os.remove(crawler._cache_entry_path(self.base + article_path(5)))
+        self.run_crawler("crawl", "--offline")
+        self.assertEqual(StubBoard.requests, [])
+        self.assertEqual(self.pages(), set(range(22)))
+        self.assertEqual(self.snapshot(), expected)
+
+    def test_failed_poll_does_not_end_watch(self):
+        polls = []
+        scan = crawler.iter_article_links
+
+        def poll(*args, **kwargs):
+            polls.append(args)
+            if len(polls) == 1:
+                raise crawler.sqlite3.OperationalError("database is locked")
+            crawler._stopping.set()  # stop after this poll
+            return scan(*args, **kwargs)
+        crawler.iter_article_links = poll
+        self.run_crawler("watch", "--interval", "0.01")
+        self.assertEqual(len(polls), 2)
+        self.assertEqual(self.pages(), set(range(25)))
+
+    def test_server_error_is_not_an_empty_page(self):
+        StubBoard.fail = {list_path(1): 1}
+        with self.assertRaises(requests.HTTPError):
+            crawler.cached_get(self.base + list_path(1))
+        self.assertFalse(os.path.exists(crawler.CACHE_DIR))
+
+    def test_workers_and_processes_write_the_same_blog(self):
+        outputs = []
+        for i, options in enumerate((["--workers", "1"], ["--workers", "4"], ["--processes", "2"])):
+            crawler.BLOG_DIR = os.path.join(self.tmp, f"blog{i}")
+            crawler.CACHE_DIR = os.path.join(self.tmp, f"cache{i}")
+            self.run_crawler("crawl", *options)
+            self.assertEqual(self.pages(), set(range(25)))
+            outputs.append(self.snapshot())
+        self.assertEqual(outputs[1], outputs[0])
+        self.assertEqual(outputs[2], outputs[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+"""
+GeminiBot against the local stand-in chat page (gemini_stand_in.html) in
+headless Chrome. Skipped when Chrome or its driver cannot be started.
+
+    python -m unittest scripts/test_gemini_bot.py
+"""
+import os
+import pathlib
+import sys
+import time
+import unittest
+from urllib.parse import urlencode
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPTS_DIR)
+import crawling_to_blog as crawler
+
+STAND_IN = pathlib.Path(SCRIPTS_DIR, "gemini_stand_in.html")
+
+
+def stand_in_url(**params):
+    return STAND_IN.as_uri() + ("?" + urlencode(params) if params else "")
+
+
+class GeminiBotTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.saved = (crawler.RESPONSE_SETTLE, crawler.RESPONSE_TIMEOUT, crawler.PROMPTS_PER_CHAT)
+        crawler.RESPONSE_SETTLE = 0.8
+        crawler.RESPONSE_TIMEOUT = 6
+        cls.bot = crawler.GeminiBot(headless=True, url=stand_in_url(), chrome_data_dir=None)
+        try:
+            cls.bot.start()
+        except Exception as e:
+            cls.tearDownClass()
+            raise unittest.SkipTest(f"headless Chrome is not available: {e}")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.bot.close()
+        crawler.RESPONSE_SETTLE, crawler.RESPONSE_TIMEOUT, crawler.PROMPTS_PER_CHAT = cls.saved
+
+    def open_chat(self, **params):
+        self.bot.url = stand_in_url(**params)
+        self.bot.login_check()
+
+    def timed_prompt(self, text):
+        start = time.monotonic()
+        reply = self.bot.send_prompt(text)
+        return reply, time.monotonic() - start
+
+    def test_session_is_reused_across_prompts(self):
+        self.addCleanup(setattr, crawler, "PROMPTS_PER_CHAT", crawler.PROMPTS_PER_CHAT)
+        crawler.PROMPTS_PER_CHAT = 2
+        self.open_chat()
+        driver = self.bot.driver
+        for text in ("첫 번째 기사 요약", "두 번째 기사 요약", "세 번째 기사 요약"):
+            self.assertEqual(self.bot.send_prompt(text), f"echo: {text}")
+        self.assertIs(self.bot.driver, driver)
+        self.assertEqual(self.bot.prompts_in_chat, 1)  # the third prompt went to a fresh chat
+
+    def test_pause_shorter_than_settle_is_not_the_end(self):
+        self.open_chat(busy=0, gap=400)
+        reply, _ = self.timed_prompt("하나 둘 셋 넷 다섯 여섯")
+        self.assertEqual(reply, "echo: 하나 둘 셋 넷 다섯 여섯")
+
+    def test_waits_while_the_stop_button_is_shown(self):
+        # Quiet for longer than RESPONSE_SETTLE mid-answer: only the stop button says it is not done
+        self.open_chat(gap=2500)
+        reply, elapsed = self.timed_prompt("하나 둘 셋 넷 다섯 여섯")
+        self.assertEqual(reply, "echo: 하나 둘 셋 넷 다섯 여섯")
+        self.assertGreater(elapsed, 2.5)
+
+    def test_returns_none_on_timeout(self):
+        self.open_chat(hang=1)
+        reply, elapsed = self.timed_prompt("끝나지 않는 답변")
+        self.assertIsNone(reply)
+        self.assertLess(elapsed, crawler.RESPONSE_TIMEOUT + 10)
+
+
+if __name__ == "__main__":
+    unittest.main()